@@ -30,11 +30,7 @@ except ImportError:
     MONGODB_AVAILABLE = False
 
 # Try to import required packages for content generation
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+from embedding_service import SENTENCE_TRANSFORMERS_AVAILABLE, get_embedding_service, warm_embedding_service
 
 try:
     from groq import Groq
@@ -45,6 +41,10 @@ except ImportError:
 # Try to import ChromaDB functions
 try:
     import chromadb
+    from chroma_registry import get_chroma_collection
+    from post_retrieval import filtered_vector_search, iter_posts_by_creators
+    from creator_inventory import get_creator_inventory
+    from retrieval_cache import query_embedding_cache, search_results_cache, make_search_key
     CHROMADB_AVAILABLE = True
 except ImportError:
     CHROMADB_AVAILABLE = False
@@ -57,6 +57,11 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Start loading the shared embedding model in the background so the first
+# generate click doesn't pay for it (no-op once loaded or loading)
+if SENTENCE_TRANSFORMERS_AVAILABLE:
+    warm_embedding_service()
+
 # Enhanced CSS with better dropdown colors and calendar styling
 def load_css():
     st.markdown("""
@@ -1804,79 +1809,70 @@ def load_profile_into_session(profile):
     except Exception as e:
         st.error(f"Error loading profile: {str(e)}")
 
-def get_posts_by_influencers(profile_names: list[str]):
-    """Get posts by specific influencer names from ChromaDB"""
+def iter_posts_by_influencers(profile_names: list[str], page_size=50, offset=0, limit=None, preview_chars=None):
+    """Lazily yield posts by specific influencer names from ChromaDB, one page at a time"""
     try:
-        # Step 1: Connect to ChromaDB
-        client = chromadb.PersistentClient(path="chroma_db")
-        collection = client.get_collection(name="posts_collection")
-
-        # Step 2: Fetch all metadata + documents
-        results = collection.get(include=["documents", "metadatas"])
-
-        # Step 3: Filter by selected profile_names
-        posts = [
-            {
-                "profile_name": meta["profile_name"],
-                "category": meta["category"],
-                "post_text": doc,
-                "scraped_at": meta.get("scraped_at", "Unknown"),
-                "post_length": len(doc)
-            }
-            for doc, meta in zip(results["documents"], results["metadatas"])
-            if meta["profile_name"] in profile_names
-        ]
+        collection = get_chroma_collection("posts_collection", path="chroma_db")
+        yield from iter_posts_by_creators(
+            collection,
+            profile_names,
+            page_size=page_size,
+            offset=offset,
+            limit=limit,
+            preview_chars=preview_chars
+        )
+    except Exception as e:
+        st.error(f"Error accessing ChromaDB: {str(e)}")
 
-        return posts
+def get_post_text(post_id):
+    """Fetch the full text of one stored post (preview rows leave it out)"""
+    try:
+        collection = get_chroma_collection("posts_collection", path="chroma_db")
+        documents = collection.get(ids=[post_id], include=["documents"])["documents"]
+        return documents[0] if documents else ""
     except Exception as e:
         st.error(f"Error accessing ChromaDB: {str(e)}")
-        return []
+        return ""
+
+def get_posts_by_influencers(profile_names: list[str]):
+    """Get posts by specific influencer names from ChromaDB"""
+    return list(iter_posts_by_influencers(profile_names))
+
+def get_creator_post_counts(profile_names: list[str]):
+    """Get {profile_name: inventory entry} for creators that have posts in ChromaDB"""
+    inventory = get_creator_inventory("chroma_db")
+    
+    # Only the first run after upgrading pays for a full metadata scan
+    if not inventory.exists():
+        collection = get_chroma_collection("posts_collection", path="chroma_db")
+        inventory.ensure_built(collection)
+    
+    return inventory.get(profile_names)
 
 def check_influencers_in_chromadb(profile_names: list[str]):
     """Check which influencers have posts available in ChromaDB"""
     try:
-        client = chromadb.PersistentClient(path="chroma_db")
-        collection = client.get_collection(name="posts_collection")
-        
-        results = collection.get(include=["metadatas"])
-        
-        available_influencers = set()
-        for meta in results["metadatas"]:
-            if meta["profile_name"] in profile_names:
-                available_influencers.add(meta["profile_name"])
-        
-        return list(available_influencers)
+        return list(get_creator_post_counts(profile_names).keys())
     except Exception as e:
         st.error(f"Error checking ChromaDB: {str(e)}")
         return []
 
 def load_embedding_model():
-    """Load the sentence transformer model for embeddings"""
+    """Get the shared embedding service (the model is loaded once per process)"""
     try:
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             st.error("Sentence Transformers not available. Please install: pip install sentence-transformers")
             return None
-        model = SentenceTransformer('all-MiniLM-L6-v2')
+        model = get_embedding_service()
+        model.get_model()
         return model
     except Exception as e:
         st.error(f"Error loading embedding model: {str(e)}")
         return None
 
-def search_similar_posts(query, selected_creators, top_k=5, include_user_posts=False, user_name=None):
+def search_similar_posts(query, selected_creators, top_k=5, include_user_posts=False, user_name=None, category=None):
     """Search for similar posts in ChromaDB based on query and selected creators"""
     try:
-        # Load embedding model
-        model = load_embedding_model()
-        if not model:
-            return []
-        
-        # Embed the query
-        query_embedding = model.encode([query])
-        
-        # Connect to ChromaDB
-        client = chromadb.PersistentClient(path="chroma_db")
-        collection = client.get_collection(name="posts_collection")
-        
         # Build the list of creators to search
         creators_to_search = selected_creators.copy() if selected_creators else []
         
@@ -1888,33 +1884,63 @@ def search_similar_posts(query, selected_creators, top_k=5, include_user_posts=F
         if not creators_to_search:
             return []
         
-        # Search for similar posts
-        results = collection.query(
-            query_embeddings=query_embedding.tolist(),
-            n_results=top_k * 3,  # Get more results to filter by creators
-            include=["documents", "metadatas", "distances"]
+        # Strip once, so the cached embedding is the embedding of its key
+        query = query.strip()
+        
+        # Repeat searches (same topic, creators and top_k) skip the model and the store
+        corpus_version = get_creator_inventory("chroma_db").corpus_version
+        search_key = make_search_key(query, creators_to_search, top_k, category) + (user_name,)
+        cached_posts = search_results_cache.get(search_key, version=corpus_version)
+        if cached_posts is not None:
+            st.session_state.last_retrieval_stats = dict(cached_posts["stats"], mode="cached")
+            return [dict(post) for post in cached_posts["posts"]]
+        
+        # Embed the query (cached per query text)
+        query_embedding = query_embedding_cache.get(query)
+        if query_embedding is None:
+            # Load embedding model
+            model = load_embedding_model()
+            if not model:
+                return []
+            query_embedding = model.encode([query])[0]
+            query_embedding_cache.put(query, query_embedding)
+        
+        # Get the shared ChromaDB collection handle
+        collection = get_chroma_collection("posts_collection", path="chroma_db")
+        
+        # Inventory counts let the search size its filter without a metadata scan
+        expected_matches = None
+        if not category:
+            creator_counts = get_creator_post_counts(creators_to_search)
+            expected_matches = sum(entry["post_count"] for entry in creator_counts.values()) or None
+        
+        # Search only the selected creators' posts (filter applied inside the index query)
+        results, stats = filtered_vector_search(
+            collection,
+            query_embedding,
+            creators_to_search,
+            top_k=top_k,
+            category=category,
+            expected_matches=expected_matches
         )
+        st.session_state.last_retrieval_stats = stats
         
-        # Filter results by selected creators (including user if specified)
-        filtered_posts = []
-        for i, (doc, meta, distance) in enumerate(zip(
-            results["documents"][0], 
-            results["metadatas"][0], 
-            results["distances"][0]
-        )):
-            if meta["profile_name"] in creators_to_search:
-                filtered_posts.append({
-                    "profile_name": meta["profile_name"],
-                    "category": meta["category"],
-                    "post_text": doc,
-                    "similarity_score": 1 - distance,  # Convert distance to similarity
-                    "distance": distance,
-                    "is_user_post": meta["profile_name"] == user_name if user_name else False
-                })
+        similar_posts = []
+        for doc, meta, distance in results:
+            similar_posts.append({
+                "profile_name": meta["profile_name"],
+                "category": meta["category"],
+                "post_text": doc,
+                "similarity_score": 1 - distance,  # Convert distance to similarity
+                "distance": distance,
+                "is_user_post": meta["profile_name"] == user_name if user_name else False
+            })
         
         # Sort by similarity and return top_k
-        filtered_posts.sort(key=lambda x: x["similarity_score"], reverse=True)
-        return filtered_posts[:top_k]
+        similar_posts.sort(key=lambda x: x["similarity_score"], reverse=True)
+        similar_posts = similar_posts[:top_k]
+        search_results_cache.put(search_key, {"posts": similar_posts, "stats": stats}, version=corpus_version)
+        return [dict(post) for post in similar_posts]
         
     except Exception as e:
         st.error(f"Error searching similar posts: {str(e)}")
@@ -2270,12 +2296,13 @@ def scrape_creator_posts(creator, creator_index):
         # Show progress without detailed logs
         with st.spinner(f"Scraping posts for {creator['name']}..."):
             try:
-                # Import the scraper class
+                # Import the scraper pool
                 sys.path.append(str(Path.cwd()))
-                from linkedin_scraper import LinkedInScraper
+                from scraper_pool import get_scraper_pool, SCRAPE_TIMEOUT_S
+                from concurrent.futures import TimeoutError as FuturesTimeoutError
                 
-                # Initialize scraper
-                scraper = LinkedInScraper(
+                # Long-lived, already logged-in browser shared across scrapes
+                pool = get_scraper_pool(
                     headless=True,
                     debug=False,
                     max_posts=50,
@@ -2283,19 +2310,32 @@ def scrape_creator_posts(creator, creator_index):
                 )
                 
                 # Scrape posts
-                posts = scraper.scrape_user_profile(creator['url'], creator['category'])                
-                # Update creator status
+                future = pool.submit(creator['url'], creator['category'], max_posts=50)
+                try:
+                    posts = future.result(timeout=SCRAPE_TIMEOUT_S)
+                except FuturesTimeoutError:
+                    if pool.cancel(future):
+                        st.error(f"Scraping {creator['name']} did not start within {SCRAPE_TIMEOUT_S // 60} minutes; skipping this creator.")
+                    else:
+                        st.error(
+                            f"Scraping {creator['name']} did not finish within {SCRAPE_TIMEOUT_S // 60} minutes; skipping this creator. "
+                            "The scrape stops in the background at its next scroll and keeps the posts found so far."
+                        )
+                    return
+                # Update creator status (incremental scrapes only return posts that are new)
+                previous_count = st.session_state.custom_creators_list[creator_index].get('posts_count', 0) or 0
                 st.session_state.custom_creators_list[creator_index]['scraped'] = True
-                st.session_state.custom_creators_list[creator_index]['posts_count'] = len(posts) if posts else 0
+                st.session_state.custom_creators_list[creator_index]['posts_count'] = previous_count + (len(posts) if posts else 0)
                 st.session_state.custom_creators_list[creator_index]['last_scraped'] = datetime.now().isoformat()
                 
-                # Close scraper
-                if hasattr(scraper, 'close'):
-                    scraper.close()
+                # An empty result from a feed that did show posts means they were all stored already
+                reached_known_posts = bool(pool.get_last_scrape(creator['url']).get('posts_seen'))
                 
                 # Show success
                 if posts and len(posts) > 0:
-                    st.success(f"✅ Successfully scraped {len(posts)} posts from {creator['name']}!")
+                    st.success(f"✅ Successfully scraped {len(posts)} new posts from {creator['name']}!")
+                elif reached_known_posts:
+                    st.info(f"ℹ️ No new posts from {creator['name']} since the last scrape.")
                 else:
                     st.warning(f"⚠️ No posts found for {creator['name']}. This could be due to privacy settings or login issues.")
                 
@@ -2303,7 +2343,7 @@ def scrape_creator_posts(creator, creator_index):
                 
             except ImportError as e:
                 st.error(f"Could not import LinkedIn scraper: {str(e)}")
-                st.info("Please ensure 'linkedin_scraper.py' exists and contains the LinkedInScraper class.")
+                st.info("Please ensure 'linkedin_scraper.py' and 'scraper_pool.py' exist.")
                 
             except Exception as e:
                 st.error(f"Error during scraping {creator['name']}: {str(e)}")
@@ -2316,24 +2356,32 @@ def scrape_user_own_posts(user_url, user_name):
     try:
         with st.spinner(f"Scraping your LinkedIn posts..."):
             try:
-                # Import the scraper class
+                # Import the scraper pool
                 sys.path.append(str(Path.cwd()))
-                from linkedin_scraper import LinkedInScraper
+                from scraper_pool import get_scraper_pool, SCRAPE_TIMEOUT_S
+                from concurrent.futures import TimeoutError as FuturesTimeoutError
                 
-                # Initialize scraper
-                scraper = LinkedInScraper(
+                # Long-lived, already logged-in browser shared across scrapes
+                pool = get_scraper_pool(
                     headless=True,
                     debug=False,
-                    max_posts=30,  # Get recent posts
+                    max_posts=50,
                     chroma_db_path="chroma_db"
                 )
                 
                 # Scrape posts with user's name as profile name and "Personal" as category
-                posts = scraper.scrape_user_profile(user_url, "Personal", profile_name_override=user_name)
-                
-                # Close scraper
-                if hasattr(scraper, 'close'):
-                    scraper.close()
+                future = pool.submit(user_url, "Personal", profile_name_override=user_name, max_posts=30)  # Get recent posts
+                try:
+                    posts = future.result(timeout=SCRAPE_TIMEOUT_S)
+                except FuturesTimeoutError:
+                    if pool.cancel(future):
+                        st.error(f"Scraping your posts did not start within {SCRAPE_TIMEOUT_S // 60} minutes; please try again later.")
+                    else:
+                        st.error(
+                            f"Scraping your posts did not finish within {SCRAPE_TIMEOUT_S // 60} minutes; please try again later. "
+                            "The scrape stops in the background at its next scroll and keeps the posts found so far."
+                        )
+                    return []
                 
                 return posts
                 
@@ -2814,6 +2862,10 @@ def display_content_generation_page():
             
             st.success(success_message)
             
+            retrieval_stats = st.session_state.get('last_retrieval_stats')
+            if retrieval_stats:
+                st.caption(f"Searched {retrieval_stats['candidates_scanned']} candidate posts ({retrieval_stats['mode']} search, {retrieval_stats['search_time_s']:.2f}s)")
+            
             with st.expander("**📋 View Reference Posts Used**"):
                 for i, post in enumerate(similar_posts, 1):
                     post_source = "Your Post" if post.get('is_user_post', False) else f"{post['profile_name']} (Reference)"
@@ -3217,11 +3269,14 @@ def get_creator_initials(name):
 
 def display_influencer_post_card(post, show_stats=True):
     """Display an influencer post in a professional card format"""
-    content_preview = post['post_text'][:300] + "..." if len(post['post_text']) > 300 else post['post_text']
+    # Rows from iter_posts_by_influencers(preview_chars=...) only carry a preview
+    post_text = post.get('post_text', post.get('post_preview', ''))
+    is_truncated = len(post_text) > 300 or post.get('is_truncated', False)
+    content_preview = post_text[:300] + "..." if is_truncated else post_text
     
     # Count hashtags and mentions
-    hashtags = len([word for word in post['post_text'].split() if word.startswith('#')])
-    mentions = len([word for word in post['post_text'].split() if word.startswith('@')])
+    hashtags = post.get('hashtags', len([word for word in post_text.split() if word.startswith('#')]))
+    mentions = post.get('mentions', len([word for word in post_text.split() if word.startswith('@')]))
     
     st.markdown(f"""
     <div class="post-container" style="margin-bottom: 20px; border-left: 4px solid #667eea;">
@@ -3251,10 +3306,18 @@ def display_influencer_post_card(post, show_stats=True):
     st.markdown("</div>", unsafe_allow_html=True)
     
     # Add expandable full content for longer posts
-    if len(post['post_text']) > 300:
+    if is_truncated:
         with st.expander("**View Full Post**"):
-            st.markdown("**Full Content:**")
-            st.text_area("", value=post['post_text'], height=200, disabled=True, key=f"full_post_{hash(post['post_text'])}", label_visibility="collapsed")
+            full_text = post.get('post_text')
+            if full_text is None:
+                # Preview rows are fetched in full only when asked for
+                state_key = f"full_post_text_{post['id']}"
+                if st.button("Load full post", key=f"load_full_post_{post['id']}"):
+                    st.session_state[state_key] = get_post_text(post['id'])
+                full_text = st.session_state.get(state_key)
+            if full_text:
+                st.markdown("**Full Content:**")
+                st.text_area("", value=full_text, height=200, disabled=True, key=f"full_post_{hash(full_text)}", label_visibility="collapsed")
 
 def display_custom_metric(label, value, icon="📊"):
     """Display a custom styled metric"""
@@ -4154,17 +4217,28 @@ elif st.session_state.current_step == 4:
                 st.markdown("### **📊 Posts from Custom Creators**")
                 
                 creator_names = [c['name'] for c in scraped_custom_creators]
-                posts = get_posts_by_influencers(creator_names)
                 
-                if posts:
-                    st.success(f"**✅ Found {len(posts)} posts from {len(creator_names)} custom creators**")
+                # Total comes from the creator inventory; only the shown page is fetched
+                try:
+                    creator_counts = get_creator_post_counts(creator_names)
+                except Exception as e:
+                    st.error(f"Error accessing ChromaDB: {str(e)}")
+                    creator_counts = {}
+                total_posts = sum(entry["post_count"] for entry in creator_counts.values())
+                posts_shown = st.session_state.get('custom_creator_posts_shown', 5)
+                
+                if total_posts:
+                    st.success(f"**✅ Found {total_posts} posts from {len(creator_names)} custom creators**")
                     
-                    # Display posts
-                    for post in posts[:5]:  # Show first 5 posts
+                    # Stream the posts straight into the cards
+                    for post in iter_posts_by_influencers(creator_names, page_size=posts_shown, limit=posts_shown, preview_chars=300):
                         display_influencer_post_card(post)
                     
-                    if len(posts) > 5:
-                        st.info(f"**Showing 5 of {len(posts)} posts. Use the Generate Content tab to search through all posts.**")
+                    if total_posts > posts_shown:
+                        st.info(f"**Showing {posts_shown} of {total_posts} posts. Use the Generate Content tab to search through all posts.**")
+                        if st.button("**Show 5 more posts**", key="show_more_custom_creator_posts"):
+                            st.session_state.custom_creator_posts_shown = posts_shown + 5
+                            st.rerun()
                 else:
                     st.info("**No posts found from custom creators yet.**")
         
@@ -0,0 +1,148 @@
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from snapshot_extraction import parse_snapshot, parse_snapshot_file
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "feeds")
+FIELDS = ["post_urn", "timestamp_text", "reactions", "comments"]
+
+# The .expected.json files were written from parse_snapshot's own output on
+# these hand-built pages, not from the in-browser extractor on live captures.
+# Scoring against them is a regression check of the offline parser; it says
+# nothing about how well either extractor handles the real site.
+
+
+def score(result, expected):
+    """Compare extracted posts with the recorded ones by text; also check the other fields of matched posts.
+
+    Regression check only: see the note on the fixtures above.
+    """
+    extracted = {post["post_text"]: post for post in result["posts"]}
+    wanted = {post["post_text"]: post for post in expected["posts"]}
+    matched = [text for text in wanted if text in extracted]
+
+    field_checks = 0
+    field_hits = 0
+    for text in matched:
+        for field in FIELDS:
+            field_checks += 1
+            if extracted[text].get(field) == wanted[text].get(field):
+                field_hits += 1
+
+    return {
+        "expected": len(wanted),
+        "extracted": len(extracted),
+        "matched": len(matched),
+        "precision": len(matched) / len(extracted) if extracted else 1.0,
+        "recall": len(matched) / len(wanted) if wanted else 1.0,
+        "field_accuracy": field_hits / field_checks if field_checks else 1.0,
+        "profile_name_ok": result["profile_name"] == expected.get("profile_name", result["profile_name"])
+    }
+
+
+def benchmark_fixture(path, iterations=20):
+    """Time repeated parses of one snapshot and check it against its .expected.json."""
+    with open(path, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = parse_snapshot(html)
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "fixture": os.path.basename(path),
+        "bytes": len(html.encode("utf-8")),
+        "posts": len(result["posts"]),
+        "elapsed_s": elapsed,
+        "ms_per_page": elapsed / iterations * 1000,
+        "posts_per_sec": len(result["posts"]) * iterations / elapsed if elapsed else 0.0
+    }
+
+    expected_path = path[:-len(".html")] + ".expected.json"
+    if os.path.exists(expected_path):
+        with open(expected_path, "r", encoding="utf-8") as f:
+            report.update(score(result, json.load(f)))
+    return report
+
+
+def benchmark_parallel(paths, iterations=20, workers=None):
+    """Throughput of parsing many snapshots across processes."""
+    batch = list(paths) * iterations
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        posts = sum(len(result["posts"]) for result in executor.map(parse_snapshot_file, batch))
+    elapsed = time.perf_counter() - start
+    pages = len(batch)
+    return {
+        "workers": workers or os.cpu_count(),
+        "pages": pages,
+        "pages_per_sec": pages / elapsed if elapsed else 0.0,
+        "posts_per_sec": posts / elapsed if elapsed else 0.0
+    }
+
+
+def run_benchmark(fixtures_dir=FIXTURES_DIR, iterations=20, workers=None):
+    """Benchmark every *.html snapshot in fixtures_dir; returns the per-fixture and overall reports."""
+    paths = sorted(glob.glob(os.path.join(fixtures_dir, "*.html")))
+    if not paths:
+        raise ValueError(f"No snapshots found in {fixtures_dir}")
+
+    fixtures = [benchmark_fixture(path, iterations) for path in paths]
+    scored = [report for report in fixtures if "matched" in report]
+    total_expected = sum(report["expected"] for report in scored)
+    total_extracted = sum(report["extracted"] for report in scored)
+    total_matched = sum(report["matched"] for report in scored)
+
+    summary = {
+        "fixtures": len(fixtures),
+        "posts_per_sec": sum(report["posts"] for report in fixtures) * iterations / sum(report["elapsed_s"] for report in fixtures),
+        "precision": total_matched / total_extracted if total_extracted else 1.0,
+        "recall": total_matched / total_expected if total_expected else 1.0,
+        "parallel": benchmark_parallel(paths, iterations, workers) if workers != 1 else None
+    }
+    return {"fixtures": fixtures, "summary": summary}
+
+
+def main():
+    """Command line entry point: python benchmark_extraction.py [--fixtures DIR]."""
+    parser = argparse.ArgumentParser(description="Benchmark offline extraction on saved feed snapshots")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Directory of *.html snapshots (with optional .expected.json to check against)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None, help="Processes for the parallel run (1 to skip it)")
+    args = parser.parse_args()
+
+    try:
+        report = run_benchmark(args.fixtures, args.iterations, args.workers)
+    except Exception as e:
+        logger.error(f"Error running extraction benchmark: {str(e)}")
+        sys.exit(1)
+
+    for fixture in report["fixtures"]:
+        line = f"{fixture['fixture']:<32} {fixture['posts']:>3} posts  {fixture['ms_per_page']:7.2f} ms/page  {fixture['posts_per_sec']:8.0f} posts/s"
+        if "matched" in fixture:
+            line += f"  regression check: precision {fixture['precision']:.2f}  recall {fixture['recall']:.2f}  fields {fixture['field_accuracy']:.2f}"
+        print(line)
+
+    summary = report["summary"]
+    print(f"Overall: {summary['posts_per_sec']:.0f} posts/s")
+    print(
+        f"Fixture regression check (expected output recorded from parse_snapshot, not live captures): "
+        f"precision {summary['precision']:.2f}, recall {summary['recall']:.2f}"
+    )
+    if summary["parallel"]:
+        parallel = summary["parallel"]
+        print(f"Parallel ({parallel['workers']} workers): {parallel['pages_per_sec']:.0f} pages/s, {parallel['posts_per_sec']:.0f} posts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+
+from replay_server import ReplayServer, ReplayConfig, FIXTURES_DIR
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def run_benchmark(profiles=3, posts_per_profile=60, max_posts=30, latency_ms=150, redirect_after_pages=None,
+                  extraction_mode="js", headless=True, fixtures_dir=FIXTURES_DIR, chroma_db_path=None):
+    """Drive LinkedInScraper against a local ReplayServer and report time per post and per phase."""
+    # The stand-in site accepts any credentials; never send real ones to it
+    os.environ["LINKEDIN_EMAIL"] = "benchmark@example.com"
+    os.environ["LINKEDIN_PASSWORD"] = "benchmark"
+
+    from linkedin_scraper import LinkedInScraper
+
+    config = ReplayConfig(
+        fixtures_dir=fixtures_dir,
+        posts_per_profile=posts_per_profile,
+        latency_ms=latency_ms,
+        redirect_after_pages=redirect_after_pages
+    )
+    server = ReplayServer(config).start()
+    chroma_db_path = chroma_db_path or tempfile.mkdtemp(prefix="scraper_benchmark_")
+
+    scraper = None
+    results = []
+    try:
+        start = time.perf_counter()
+        scraper = LinkedInScraper(
+            headless=headless,
+            debug=False,
+            max_posts=max_posts,
+            chroma_db_path=chroma_db_path,
+            incremental=False,
+            extraction_mode=extraction_mode,
+            resume_session=False,
+            replay_logs=False,
+            base_url=server.url
+        )
+        startup_time = time.perf_counter() - start
+
+        for i in range(profiles):
+            profile_url = f"{server.url}/in/replay-creator-{i}/"
+            start = time.perf_counter()
+            posts = scraper.scrape_user_profile(profile_url, "Benchmark")
+            elapsed = time.perf_counter() - start
+            results.append({"profile_url": profile_url, "posts": len(posts), "elapsed_s": elapsed, "scroll": scraper.get_scroll_stats()})
+            logger.info(f"{profile_url}: {len(posts)} posts in {elapsed:.1f}s")
+
+        total_posts = sum(result["posts"] for result in results)
+        total_time = sum(result["elapsed_s"] for result in results)
+        return {
+            "startup_s": startup_time,
+            "startup_phases": scraper.get_startup_stats(),
+            "profiles": results,
+            "total_posts": total_posts,
+            "total_s": total_time,
+            "s_per_post": total_time / total_posts if total_posts else None,
+            "posts_per_sec": total_posts / total_time if total_time else 0.0,
+            "wait_phases": scraper.get_wait_stats(),
+            "expansion": dict(scraper.expansion_stats),
+            "pipeline": scraper.get_pipeline_stats(),
+            "lifecycle": scraper.get_lifecycle_stats(),
+            "server": dict(server.stats)
+        }
+    finally:
+        if scraper is not None:
+            scraper.close()
+        server.stop()
+
+
+def main():
+    """Command line entry point: python benchmark_scraper.py [--profiles 3] [--redirect-after 4]."""
+    parser = argparse.ArgumentParser(description="Benchmark the scraper end to end against a local LinkedIn stand-in")
+    parser.add_argument("--profiles", type=int, default=3)
+    parser.add_argument("--posts", type=int, default=60, help="Posts in each served feed")
+    parser.add_argument("--max-posts", type=int, default=30, help="Scraper max_posts")
+    parser.add_argument("--latency-ms", type=int, default=150)
+    parser.add_argument("--redirect-after", type=int, default=None, help="Inject a checkpoint redirect after this many feed pages")
+    parser.add_argument("--extraction-mode", default="js", choices=["js", "snapshot", "dom"])
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--show-browser", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        report = run_benchmark(
+            profiles=args.profiles,
+            posts_per_profile=args.posts,
+            max_posts=args.max_posts,
+            latency_ms=args.latency_ms,
+            redirect_after_pages=args.redirect_after,
+            extraction_mode=args.extraction_mode,
+            headless=not args.show_browser,
+            fixtures_dir=args.fixtures
+        )
+    except Exception as e:
+        logger.error(f"Error running scraper benchmark: {str(e)}")
+        sys.exit(1)
+
+    print(f"Startup: {report['startup_s']:.2f}s " + ", ".join(f"{phase} {elapsed:.2f}s" for phase, elapsed in report["startup_phases"].items()))
+    for result in report["profiles"]:
+        scroll = result["scroll"]
+        print(
+            f"{result['profile_url']}: {result['posts']} posts in {result['elapsed_s']:.1f}s "
+            f"({scroll.get('scrolls', 0)} scrolls, stopped on {scroll.get('stop_reason')}, {scroll.get('posts_per_sec', 0.0):.2f} posts/s)"
+        )
+    if report["s_per_post"] is not None:
+        print(f"Total: {report['total_posts']} posts in {report['total_s']:.1f}s ({report['s_per_post']:.2f}s/post, {report['posts_per_sec']:.1f} posts/s)")
+    print("Waits per phase:")
+    for phase, stats in sorted(report["wait_phases"].items(), key=lambda item: -item[1]["total_s"]):
+        print(f"  {phase:<28} {stats['total_s']:7.2f}s over {stats['waits']:>3} waits (max {stats['max_s']:.2f}s, {stats['timeouts']} timeouts)")
+    print(f"Server: {report['server']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import logging
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Defaults for restarting a long-running browser; both can be set per
+# scraper or through SCRAPER_MAX_PROFILES_PER_BROWSER and
+# SCRAPER_MAX_BROWSER_RSS_MB ("0" disables a limit)
+MAX_PROFILES_PER_BROWSER = 25
+MAX_BROWSER_RSS_MB = 1500
+
+# Launch attempts when replacing a recycled browser before giving up on it
+RELAUNCH_ATTEMPTS = 2
+
+
+class BrowserUnavailableError(RuntimeError):
+    """The scraper's browser could not be relaunched; the scraper needs replacing."""
+
+
+def process_tree_rss_mb(pid):
+    """Resident memory of a process and all its descendants in MB, or None without psutil."""
+    if not PSUTIL_AVAILABLE or pid is None:
+        return None
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            # Renderer processes come and go while a page is open
+            continue
+    return total / (1024 * 1024)
+
+
+def limit_from_env(name, default):
+    """Read a whole-number limit from the environment, falling back to default if unset or malformed."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring {name}={value!r} (not a whole number); using {default}")
+        return default
+
+
+class RecyclePolicy:
+    """When a long-lived browser should be replaced by a fresh one.
+
+    Chrome's memory grows with every feed scrolled in a session and each
+    scroll gets slower; restarting after a number of profiles, or once the
+    browser crosses a memory ceiling, keeps per-profile time flat.
+    """
+
+    def __init__(self, max_profiles=None, max_rss_mb=None):
+        """Limits left as None come from the environment, or the module defaults."""
+        if max_profiles is None:
+            max_profiles = limit_from_env("SCRAPER_MAX_PROFILES_PER_BROWSER", MAX_PROFILES_PER_BROWSER)
+        if max_rss_mb is None:
+            max_rss_mb = limit_from_env("SCRAPER_MAX_BROWSER_RSS_MB", MAX_BROWSER_RSS_MB)
+        self.max_profiles = max_profiles or None
+        self.max_rss_mb = max_rss_mb or None
+        if self.max_rss_mb and not PSUTIL_AVAILABLE:
+            logger.info("psutil not installed; browsers are recycled by profile count only")
+
+    def check(self, profiles_since_restart, rss_mb=None):
+        """Return the reason to restart ('profile_limit' or 'memory_limit'), or None."""
+        if self.max_profiles and profiles_since_restart >= self.max_profiles:
+            return "profile_limit"
+        if self.max_rss_mb and rss_mb is not None and rss_mb >= self.max_rss_mb:
+            return "memory_limit"
+        return None
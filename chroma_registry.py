@@ -0,0 +1,150 @@
+import os
+import time
+import logging
+import threading
+
+import chromadb
+
+logger = logging.getLogger(__name__)
+
+
+class ChromaClientRegistry:
+    """Hands out one PersistentClient and cached collection handles for a ChromaDB path."""
+
+    def __init__(self, path="chroma_db", health_check_interval=30.0):
+        self.path = path
+        self.health_check_interval = health_check_interval
+        self._client = None
+        self._collections = {}
+        self._last_health_check = 0.0
+        self._lock = threading.RLock()
+
+        # Counters
+        self.clients_opened = 0
+        self.client_reuses = 0
+        self.collections_opened = 0
+        self.collection_reuses = 0
+        self.health_check_failures = 0
+
+    def _open_client(self):
+        logger.info(f"Opening ChromaDB client at '{self.path}'")
+        self._client = chromadb.PersistentClient(path=self.path)
+        self._collections = {}
+        self._last_health_check = time.monotonic()
+        self.clients_opened += 1
+
+    def _reset(self):
+        self._client = None
+        self._collections = {}
+
+    def check_health(self, force=False):
+        """Heartbeat the client; drop it (and its collections) if it no longer responds."""
+        with self._lock:
+            if self._client is None:
+                return False
+
+            now = time.monotonic()
+            if not force and now - self._last_health_check < self.health_check_interval:
+                return True
+
+            try:
+                self._client.heartbeat()
+                self._last_health_check = now
+                return True
+            except Exception as e:
+                logger.warning(f"ChromaDB client at '{self.path}' failed health check: {str(e)}")
+                self.health_check_failures += 1
+                self._reset()
+                return False
+
+    def get_client(self):
+        """Return the shared client, opening it on first use or after a failed health check."""
+        with self._lock:
+            if self._client is not None and self.check_health():
+                self.client_reuses += 1
+                return self._client
+
+            self._open_client()
+            return self._client
+
+    def get_collection(self, name="posts_collection", create=False, embedding_function=None, metadata=None):
+        """Return a cached collection handle, opening it on first use.
+
+        Raises like chromadb's get_collection when the collection is missing and create is False.
+        """
+        key = (name, type(embedding_function).__name__ if embedding_function is not None else None)
+
+        with self._lock:
+            client = self.get_client()
+
+            collection = self._collections.get(key)
+            if collection is not None:
+                self.collection_reuses += 1
+                return collection
+
+            kwargs = {"name": name}
+            if embedding_function is not None:
+                kwargs["embedding_function"] = embedding_function
+
+            if create:
+                if metadata:
+                    kwargs["metadata"] = metadata
+                collection = client.get_or_create_collection(**kwargs)
+            else:
+                collection = client.get_collection(**kwargs)
+
+            self._collections[key] = collection
+            self.collections_opened += 1
+            return collection
+
+    def invalidate(self, name=None):
+        """Forget cached collection handles (all of them, or those for one name)."""
+        with self._lock:
+            if name is None:
+                self._collections = {}
+            else:
+                self._collections = {key: value for key, value in self._collections.items() if key[0] != name}
+
+    def get_stats(self):
+        """Return open/reuse counters for this path."""
+        with self._lock:
+            return {
+                "path": self.path,
+                "client_open": self._client is not None,
+                "clients_opened": self.clients_opened,
+                "client_reuses": self.client_reuses,
+                "collections_opened": self.collections_opened,
+                "collection_reuses": self.collection_reuses,
+                "cached_collections": len(self._collections),
+                "health_check_failures": self.health_check_failures
+            }
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_chroma_registry(path="chroma_db"):
+    """Return the process-wide registry for a ChromaDB path."""
+    key = os.path.abspath(path)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = ChromaClientRegistry(path)
+            _registries[key] = registry
+        return registry
+
+
+def get_chroma_client(path="chroma_db"):
+    """Shortcut for get_chroma_registry(path).get_client()."""
+    return get_chroma_registry(path).get_client()
+
+
+def get_chroma_collection(name="posts_collection", path="chroma_db", create=False, embedding_function=None, metadata=None):
+    """Shortcut for get_chroma_registry(path).get_collection(...)."""
+    return get_chroma_registry(path).get_collection(
+        name,
+        create=create,
+        embedding_function=embedding_function,
+        metadata=metadata
+    )
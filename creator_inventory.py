@@ -0,0 +1,202 @@
+import os
+import json
+import logging
+import tempfile
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+INVENTORY_FILENAME = "creator_inventory.json"
+
+
+class CreatorInventory:
+    """Per-creator post counts, last scraped_at and category, kept next to the ChromaDB store.
+
+    Lets callers learn which creators have posts without scanning every
+    post's metadata in posts_collection.
+    """
+
+    def __init__(self, chroma_db_path="chroma_db"):
+        self.chroma_db_path = chroma_db_path
+        self.path = os.path.join(chroma_db_path, INVENTORY_FILENAME)
+        self._lock = threading.RLock()
+        self._creators = {}
+        self._corpus_version = 0
+        self._loaded_mtime = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _reload_if_changed(self):
+        """Re-read the file if another process (e.g. a scraper run) rewrote it."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+
+        if mtime == self._loaded_mtime:
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._creators = data.get("creators", {})
+            self._corpus_version = data.get("corpus_version", 0)
+            self._loaded_mtime = mtime
+        except Exception as e:
+            logger.error(f"Error reading creator inventory: {str(e)}")
+
+    def _save(self):
+        # Every write means the corpus changed, so cached search results are stale
+        self._corpus_version += 1
+        os.makedirs(self.chroma_db_path, exist_ok=True)
+        # A unique temp file, so writers in other processes never share (or tear) one
+        fd, tmp_path = tempfile.mkstemp(prefix=INVENTORY_FILENAME + ".", suffix=".tmp", dir=self.chroma_db_path)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "updated_at": datetime.now().isoformat(),
+                    "corpus_version": self._corpus_version,
+                    "creators": self._creators
+                }, f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._loaded_mtime = os.path.getmtime(self.path)
+
+    def _apply(self, metadatas, count=True):
+        for meta in metadatas:
+            name = meta.get("profile_name")
+            if not name:
+                continue
+
+            entry = self._creators.setdefault(name, {
+                "post_count": 0,
+                "last_scraped_at": None,
+                "category": None,
+                "profile_url": None
+            })
+            if count:
+                entry["post_count"] += 1
+
+            scraped_at = meta.get("scraped_at")
+            if scraped_at and (entry["last_scraped_at"] is None or scraped_at > entry["last_scraped_at"]):
+                entry["last_scraped_at"] = scraped_at
+                entry["category"] = meta.get("category", entry["category"])
+                entry["profile_url"] = meta.get("profile_url", entry["profile_url"])
+            elif entry["category"] is None:
+                entry["category"] = meta.get("category")
+                entry["profile_url"] = meta.get("profile_url")
+
+    def _can_update(self):
+        # An incremental update must never create the file: it would hold only
+        # these posts, and ensure_built would then skip the full rebuild
+        if self.exists():
+            return True
+        logger.warning("Creator inventory has not been built yet; skipping incremental update")
+        return False
+
+    def record_posts(self, metadatas, updated_metadatas=()):
+        """Add newly written posts (their ChromaDB metadata dicts) to the inventory.
+
+        updated_metadatas are re-written existing posts: they refresh
+        last_scraped_at/category without changing the counts. Does nothing
+        until the inventory has been built from the collection.
+        """
+        with self._lock:
+            if not self._can_update():
+                return
+            self._reload_if_changed()
+            self._apply(metadatas)
+            self._apply(updated_metadatas, count=False)
+            self._save()
+
+    def remove_posts(self, metadatas):
+        """Decrement counts for posts that were deleted from the collection."""
+        with self._lock:
+            if not self._can_update():
+                return
+            self._reload_if_changed()
+            for meta in metadatas:
+                entry = self._creators.get(meta.get("profile_name"))
+                if entry is None:
+                    continue
+                entry["post_count"] -= 1
+                if entry["post_count"] <= 0:
+                    del self._creators[meta["profile_name"]]
+            self._save()
+
+    def rebuild_from_collection(self, collection, batch_size=1000):
+        """Rebuild the inventory with one paged scan over the collection's metadata."""
+        with self._lock:
+            self._reload_if_changed()
+            self._creators = {}
+            offset = 0
+            while True:
+                results = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+                metadatas = results["metadatas"]
+                if not metadatas:
+                    break
+                self._apply(metadatas)
+                offset += len(metadatas)
+            self._save()
+            logger.info(f"Rebuilt creator inventory: {len(self._creators)} creators, {offset} posts")
+
+    def ensure_built(self, collection):
+        """Build the inventory from the collection once if it has never been written."""
+        if not self.exists():
+            self.rebuild_from_collection(collection)
+
+    def get(self, profile_names):
+        """Return {profile_name: entry} for the given names that have posts."""
+        with self._lock:
+            self._reload_if_changed()
+            result = {}
+            for name in profile_names:
+                entry = self._creators.get(name)
+                if entry and entry["post_count"] > 0:
+                    result[name] = dict(entry)
+            return result
+
+    def available(self, profile_names):
+        """Return the subset of profile_names that have posts."""
+        return list(self.get(profile_names).keys())
+
+    @property
+    def corpus_version(self):
+        """Counter bumped on every inventory write (i.e. every change to posts_collection)."""
+        with self._lock:
+            self._reload_if_changed()
+            return self._corpus_version
+
+    def bump_corpus_version(self):
+        """Mark the corpus as changed without touching the counts."""
+        with self._lock:
+            if not self._can_update():
+                return
+            self._reload_if_changed()
+            self._save()
+
+    def all(self):
+        """Return a copy of the whole inventory."""
+        with self._lock:
+            self._reload_if_changed()
+            return {name: dict(entry) for name, entry in self._creators.items()}
+
+
+_inventories = {}
+_inventories_lock = threading.Lock()
+
+
+def get_creator_inventory(chroma_db_path="chroma_db"):
+    """Return the process-wide inventory for a ChromaDB path."""
+    key = os.path.abspath(chroma_db_path)
+    with _inventories_lock:
+        inventory = _inventories.get(key)
+        if inventory is None:
+            inventory = CreatorInventory(chroma_db_path)
+            _inventories[key] = inventory
+        return inventory
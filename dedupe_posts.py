@@ -0,0 +1,128 @@
+import sys
+import logging
+import argparse
+
+from chroma_registry import get_chroma_registry
+from creator_inventory import get_creator_inventory
+from post_ids import make_post_id
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def _scan(collection, batch_size):
+    """Yield (id, document, metadata, embedding) for every stored post, a page at a time."""
+    offset = 0
+    while True:
+        results = collection.get(
+            limit=batch_size,
+            offset=offset,
+            include=["documents", "metadatas", "embeddings"]
+        )
+        if not results["ids"]:
+            return
+        yield from zip(results["ids"], results["documents"], results["metadatas"], results["embeddings"])
+        offset += len(results["ids"])
+
+
+def _write(collection, rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        collection.upsert(
+            ids=[row[0] for row in batch],
+            documents=[row[1] for row in batch],
+            metadatas=[row[2] for row in batch],
+            embeddings=[list(row[3]) for row in batch]
+        )
+
+
+def dedupe_posts_collection(chroma_db_path="chroma_db", collection_name="posts_collection", batch_size=500, compact=False, dry_run=False):
+    """Collapse duplicate posts onto their deterministic content-hash IDs.
+
+    For every (profile_url, normalized text) group the most recently scraped
+    copy is kept under make_post_id(...) and all other copies are deleted.
+    With compact=True the surviving posts are copied into a fresh collection
+    that replaces the old one, so the index no longer carries deleted entries.
+
+    Returns a report dict with scanned/unique/duplicates_removed counts.
+    """
+    registry = get_chroma_registry(chroma_db_path)
+    collection = registry.get_collection(collection_name)
+
+    # Pick the newest copy of each post
+    keep = {}
+    all_ids = []
+    for post_id, doc, meta, embedding in _scan(collection, batch_size):
+        all_ids.append(post_id)
+        canonical_id = make_post_id(meta.get("profile_url") or meta.get("profile_name", ""), doc)
+        current = keep.get(canonical_id)
+        if current is None or meta.get("scraped_at", "") > current[2].get("scraped_at", ""):
+            keep[canonical_id] = (canonical_id, doc, meta, embedding, post_id)
+
+    report = {
+        "scanned": len(all_ids),
+        "unique": len(keep),
+        "duplicates_removed": len(all_ids) - len(keep),
+        "compacted": False
+    }
+    logger.info(f"Scanned {report['scanned']} posts: {report['unique']} unique, {report['duplicates_removed']} duplicates")
+
+    if dry_run:
+        return report
+
+    rows = list(keep.values())
+
+    if compact:
+        # Build a fresh collection and swap it in place of the old one
+        client = registry.get_client()
+        tmp_name = f"{collection_name}_compacted"
+        try:
+            client.delete_collection(tmp_name)
+        except Exception:
+            pass
+        new_collection = client.create_collection(name=tmp_name, metadata=collection.metadata)
+        _write(new_collection, rows, batch_size)
+        client.delete_collection(collection_name)
+        new_collection.modify(name=collection_name)
+        registry.invalidate(collection_name)
+        report["compacted"] = True
+    else:
+        _write(collection, rows, batch_size)
+        kept_ids = set(keep.keys())
+        stale_ids = [post_id for post_id in all_ids if post_id not in kept_ids]
+        for start in range(0, len(stale_ids), batch_size):
+            collection.delete(ids=stale_ids[start:start + batch_size])
+
+    # Counts changed, so rebuild the inventory (this also bumps the corpus version)
+    get_creator_inventory(chroma_db_path).rebuild_from_collection(registry.get_collection(collection_name))
+
+    logger.info(f"Removed {report['duplicates_removed']} duplicate posts")
+    return report
+
+
+def main():
+    """Command line entry point: python dedupe_posts.py [--compact] [--dry-run]."""
+    parser = argparse.ArgumentParser(description="Remove duplicate posts from the ChromaDB posts collection")
+    parser.add_argument("--chroma-db-path", default="chroma_db")
+    parser.add_argument("--collection", default="posts_collection")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--compact", action="store_true", help="Rebuild the collection after deduplicating")
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many duplicates exist")
+    args = parser.parse_args()
+
+    try:
+        report = dedupe_posts_collection(
+            chroma_db_path=args.chroma_db_path,
+            collection_name=args.collection,
+            batch_size=args.batch_size,
+            compact=args.compact,
+            dry_run=args.dry_run
+        )
+        print(f"Scanned {report['scanned']} posts, kept {report['unique']}, removed {report['duplicates_removed']} duplicates")
+    except Exception as e:
+        logger.error(f"Error deduplicating posts: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
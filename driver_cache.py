@@ -0,0 +1,139 @@
+import os
+import re
+import json
+import shutil
+import logging
+import threading
+import subprocess
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "linkedin-content-generator", "chromedriver.json")
+
+CHROME_BINARY_CANDIDATES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+_resolved_path = None
+_resolve_lock = threading.Lock()
+
+
+def binary_version(binary):
+    """Return the version printed by `binary --version`, or None."""
+    try:
+        output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except Exception:
+        return None
+    match = re.search(r"\d+(\.\d+){2,3}", output)
+    return match.group(0) if match else None
+
+
+def _major(version):
+    return version.split(".")[0] if version else None
+
+
+def find_chrome_version():
+    """Return the installed Chrome/Chromium version, or None if it can't be found locally."""
+    binary = os.getenv("CHROME_BINARY")
+    candidates = [binary] if binary else CHROME_BINARY_CANDIDATES
+    for candidate in candidates:
+        path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if path and os.path.exists(path):
+            version = binary_version(path)
+            if version:
+                return version
+    return None
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _write_cache(cache_path, driver_path, driver_version, browser_version):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "driver_path": driver_path,
+                "driver_version": driver_version,
+                "browser_version": browser_version,
+                "resolved_at": datetime.now().isoformat()
+            }, f)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Could not write chromedriver cache: {str(e)}")
+
+
+def _matches(driver_path, browser_version):
+    """Check a driver binary locally: it must exist and share the browser's major version."""
+    if not driver_path or not os.path.exists(driver_path):
+        return None
+    driver_version = binary_version(driver_path)
+    if driver_version is None:
+        return None
+    if browser_version and _major(driver_version) != _major(browser_version):
+        return None
+    return driver_version
+
+
+def resolve_chromedriver(cache_path=DEFAULT_CACHE_PATH, offline=None):
+    """Return a chromedriver path that matches the installed browser.
+
+    Checked in order: CHROMEDRIVER_PATH, the cached driver from the last run,
+    a chromedriver on PATH, and only then ChromeDriverManager (which needs the
+    network). The version checks run the binaries locally. With offline=True,
+    or CHROMEDRIVER_OFFLINE=1, the manager is never used.
+    """
+    global _resolved_path
+
+    with _resolve_lock:
+        # Pool workers in the same process resolve once
+        if _resolved_path and os.path.exists(_resolved_path):
+            return _resolved_path
+
+        env_path = os.getenv("CHROMEDRIVER_PATH")
+        if env_path:
+            _resolved_path = env_path
+            return env_path
+
+        if offline is None:
+            offline = os.getenv("CHROMEDRIVER_OFFLINE", "").lower() in ("1", "true", "yes")
+
+        browser_version = find_chrome_version()
+        if browser_version is None:
+            logger.info("Could not read the browser version; trusting any working cached driver")
+
+        cached = _read_cache(cache_path)
+        driver_version = _matches(cached.get("driver_path"), browser_version)
+        if driver_version:
+            logger.info(f"Using cached chromedriver {driver_version}: {cached['driver_path']}")
+            _resolved_path = cached["driver_path"]
+            return _resolved_path
+
+        path_driver = shutil.which("chromedriver")
+        driver_version = _matches(path_driver, browser_version)
+        if driver_version:
+            logger.info(f"Using chromedriver {driver_version} from PATH: {path_driver}")
+            _write_cache(cache_path, path_driver, driver_version, browser_version)
+            _resolved_path = path_driver
+            return path_driver
+
+        if offline:
+            raise RuntimeError(f"No chromedriver matching Chrome {browser_version} found and offline mode is on")
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        logger.info("No matching cached chromedriver, resolving with ChromeDriverManager")
+        driver_path = ChromeDriverManager().install()
+        _write_cache(cache_path, driver_path, binary_version(driver_path), browser_version)
+        _resolved_path = driver_path
+        return driver_path
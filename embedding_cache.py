@@ -0,0 +1,161 @@
+import os
+import hashlib
+import logging
+import threading
+
+import numpy as np
+
+from embedding_service import DEFAULT_MODEL_NAME, get_embedding_service
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILENAME = "vectors.f32"
+INDEX_FILENAME = "index.tsv"
+
+
+def content_hash(text):
+    """Stable hash of a text, used as the cache key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Content-addressed on-disk embedding cache.
+
+    Vectors live in one append-only float32 file read through np.memmap;
+    index.tsv maps each text hash to its row. Only texts that were never
+    seen before are sent to the model. Assumes one writing process at a time.
+    """
+
+    def __init__(self, cache_dir="chroma_db/embedding_cache", model_name=DEFAULT_MODEL_NAME):
+        self.model_name = model_name
+        self.cache_dir = os.path.join(cache_dir, model_name.replace("/", "_"))
+        self.vectors_path = os.path.join(self.cache_dir, VECTORS_FILENAME)
+        self.index_path = os.path.join(self.cache_dir, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._index = {}
+        self._dim = None
+        self._rows = 0
+        self._vectors = None
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            header = f.readline().strip()
+            if not header.startswith("dim\t"):
+                logger.warning(f"Ignoring embedding cache with unexpected header: {self.index_path}")
+                return
+            self._dim = int(header.split("\t")[1])
+
+            # Rows past the end of the vector file come from an interrupted write
+            vector_rows = os.path.getsize(self.vectors_path) // (4 * self._dim) if os.path.exists(self.vectors_path) else 0
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 2:
+                    continue
+                row = int(parts[1])
+                if row < vector_rows:
+                    self._index[parts[0]] = row
+
+        # Drop a partially written trailing vector so later appends stay aligned
+        if os.path.exists(self.vectors_path) and os.path.getsize(self.vectors_path) != vector_rows * 4 * self._dim:
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(vector_rows * 4 * self._dim)
+
+        self._rows = vector_rows
+        logger.info(f"Loaded embedding cache with {len(self._index)} vectors from {self.cache_dir}")
+
+    def _get_vectors(self):
+        if self._vectors is None and self._rows:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self._dim))
+        return self._vectors
+
+    def _append(self, hashes, embeddings):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        if self._dim is None:
+            self._dim = embeddings.shape[1]
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                f.write(f"dim\t{self._dim}\n")
+
+        # Vectors first, then index lines, so a crash never indexes a missing row
+        with open(self.vectors_path, "ab") as f:
+            f.write(embeddings.tobytes())
+
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            for i, text_hash in enumerate(hashes):
+                row = self._rows + i
+                self._index[text_hash] = row
+                f.write(f"{text_hash}\t{row}\n")
+
+        self._rows += len(hashes)
+        self._vectors = None  # remap on next read
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, text):
+        return content_hash(text) in self._index
+
+    def encode(self, texts, embedding_service=None, batch_size=32, show_progress_bar=False):
+        """Return embeddings for texts, encoding only the ones not cached yet."""
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self._dim or 0), dtype=np.float32)
+
+        hashes = [content_hash(text) for text in texts]
+
+        with self._lock:
+            # Encode each unseen text once, even if it repeats within the batch
+            missing = {}
+            for text_hash, text in zip(hashes, texts):
+                if text_hash not in self._index and text_hash not in missing:
+                    missing[text_hash] = text
+
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+            if missing:
+                service = embedding_service or get_embedding_service(self.model_name)
+                new_embeddings = service.encode(list(missing.values()), batch_size=batch_size, show_progress_bar=show_progress_bar)
+                self._append(list(missing.keys()), new_embeddings)
+
+            vectors = self._get_vectors()
+            rows = [self._index[text_hash] for text_hash in hashes]
+            result = np.array(vectors[rows], dtype=np.float32)
+
+        logger.info(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} encoded")
+        return result
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "cache_dir": self.cache_dir,
+            "vectors": len(self._index),
+            "dim": self._dim,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(cache_dir="chroma_db/embedding_cache", model_name=DEFAULT_MODEL_NAME):
+    """Return the process-wide EmbeddingCache for a directory and model."""
+    key = (os.path.abspath(cache_dir), model_name)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(cache_dir, model_name)
+            _caches[key] = cache
+        return cache
@@ -0,0 +1,145 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Try to import sentence transformers
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+
+class EmbeddingService:
+    """Process-wide holder for a single SentenceTransformer model."""
+
+    def __init__(self, model_name=DEFAULT_MODEL_NAME):
+        self.model_name = model_name
+        self._model = None
+        self._warming = False
+        self._load_lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        # Timing stats
+        self.load_time = None
+        self.encode_calls = 0
+        self.encoded_texts = 0
+        self.total_encode_time = 0.0
+        self.last_encode_time = None
+
+    @property
+    def is_loaded(self):
+        return self._model is not None
+
+    def get_model(self):
+        """Return the loaded model, loading it on first use."""
+        if self._model is not None:
+            return self._model
+
+        with self._load_lock:
+            # Another thread may have finished loading while we waited
+            if self._model is not None:
+                return self._model
+
+            if not SENTENCE_TRANSFORMERS_AVAILABLE:
+                raise ImportError("Sentence Transformers not available. Please install: pip install sentence-transformers")
+
+            logger.info(f"Loading sentence transformer model '{self.model_name}'...")
+            start = time.perf_counter()
+            self._model = SentenceTransformer(self.model_name)
+            self.load_time = time.perf_counter() - start
+            logger.info(f"Sentence transformer model loaded in {self.load_time:.2f}s")
+
+        return self._model
+
+    def warm(self):
+        """Load the model and run one tiny encode so the first real call is fast."""
+        try:
+            self.encode(["warmup"])
+            return True
+        except Exception as e:
+            logger.error(f"Error warming embedding model: {str(e)}")
+            # Allow a later warm-up attempt
+            self._warming = False
+            return False
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False):
+        """Encode a list of texts into a numpy array of embeddings."""
+        if isinstance(texts, str):
+            texts = [texts]
+
+        model = self.get_model()
+
+        # SentenceTransformer.encode is not guaranteed to be thread-safe
+        start = time.perf_counter()
+        with self._encode_lock:
+            embeddings = model.encode(list(texts), batch_size=batch_size, show_progress_bar=show_progress_bar)
+        elapsed = time.perf_counter() - start
+
+        with self._stats_lock:
+            self.encode_calls += 1
+            self.encoded_texts += len(texts)
+            self.total_encode_time += elapsed
+            self.last_encode_time = elapsed
+
+        return embeddings
+
+    def get_stats(self):
+        """Return load time and per-call latency figures."""
+        with self._stats_lock:
+            avg_latency = self.total_encode_time / self.encode_calls if self.encode_calls else 0.0
+            return {
+                "model_name": self.model_name,
+                "loaded": self.is_loaded,
+                "load_time_s": self.load_time,
+                "encode_calls": self.encode_calls,
+                "encoded_texts": self.encoded_texts,
+                "total_encode_time_s": self.total_encode_time,
+                "avg_encode_latency_s": avg_latency,
+                "last_encode_latency_s": self.last_encode_time
+            }
+
+
+class ServiceEmbeddingFunction:
+    """Adapter so ChromaDB collections embed query_texts with the shared model."""
+
+    def __init__(self, service=None):
+        self.service = service or get_embedding_service()
+
+    def __call__(self, input):
+        return self.service.encode(input).tolist()
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_embedding_service(model_name=DEFAULT_MODEL_NAME):
+    """Return the process-wide EmbeddingService for model_name."""
+    with _services_lock:
+        service = _services.get(model_name)
+        if service is None:
+            service = EmbeddingService(model_name)
+            _services[model_name] = service
+        return service
+
+
+def warm_embedding_service(model_name=DEFAULT_MODEL_NAME, background=True):
+    """Start loading the shared model, optionally on a background thread."""
+    service = get_embedding_service(model_name)
+    with _services_lock:
+        if service.is_loaded or service._warming:
+            return service
+        service._warming = True
+
+    if background:
+        thread = threading.Thread(target=service.warm, name="embedding-warmup", daemon=True)
+        thread.start()
+    else:
+        service.warm()
+    return service
@@ -0,0 +1,63 @@
+# CSS selectors and markers for LinkedIn activity feeds, shared by every extraction path
+
+# Profile name heading on profile and activity pages
+PROFILE_NAME_SELECTORS = [
+    "h1.text-heading-xlarge",
+    ".pv-text-details__left-panel h1"
+]
+
+# Post container selectors, most specific first
+POST_CONTAINER_SELECTORS = [
+    ".feed-shared-update-v2",
+    ".occludable-update",
+    ".profile-creator-shared-feed-update__container"
+]
+
+# Leading phrases that mark activity (likes, comments, reposts) rather than an original post
+ACTIVITY_TEXTS = [
+    "liked", "commented on", "replied", "reposted",
+    "shared", "celebrates", "mentioned in", "follows"
+]
+
+# Elements whose presence (with text) marks a post as original content
+CONTENT_SELECTORS = [
+    ".feed-shared-update-v2__description",
+    ".feed-shared-text",
+    ".update-components-text",
+    ".feed-shared-text-view",
+    ".update-components-update-v2__commentary"
+]
+
+# Elements holding the post body; the longest match wins
+TEXT_SELECTORS = [
+    ".feed-shared-update-v2__description",
+    ".feed-shared-text",
+    ".update-components-text",
+    ".feed-shared-text-view"
+]
+
+# "See more" buttons that expand truncated post text
+SEE_MORE_SELECTORS = [
+    ".inline-show-more-text__button",
+    ".feed-shared-inline-show-more-text__see-more",
+    ".feed-shared-text-view__see-more",
+    ".see-more",
+    "span.lt-line-clamp__more"
+]
+
+# Relative timestamp ("2d", "1w • Edited") shown under the author
+TIMESTAMP_SELECTORS = [
+    ".update-components-actor__sub-description span[aria-hidden='true']",
+    ".feed-shared-actor__sub-description span[aria-hidden='true']",
+    ".update-components-actor__sub-description",
+    ".feed-shared-actor__sub-description"
+]
+
+# Reaction and comment counters
+REACTIONS_SELECTORS = [
+    ".social-details-social-counts__reactions-count",
+    ".social-details-social-counts__social-proof-fallback-number"
+]
+COMMENTS_SELECTORS = [
+    ".social-details-social-counts__comments"
+]
@@ -3,7 +3,9 @@ import sys
 import time
 import random
 import re
+import json
 import logging
+import threading
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -16,14 +18,27 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from selenium.webdriver.common.action_chains import ActionChains
 from dotenv import load_dotenv
 from uuid import uuid4
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
+from post_ids import make_post_id
+from scrape_state import get_high_water_marks, mark_reached
+from session_store import SessionStore, SESSION_FILENAME
+from save_pipeline import SavePipeline
+from post_storage import PostStorageMixin
+from page_waits import PageWaiter
+from scroll_controller import ScrollController, MAX_SCROLLS
+from browser_lifecycle import (
+    RecyclePolicy, BrowserUnavailableError, process_tree_rss_mb, RELAUNCH_ATTEMPTS
+)
+from snapshot_extraction import parse_snapshot
+from feed_selectors import (
+    PROFILE_NAME_SELECTORS, POST_CONTAINER_SELECTORS, ACTIVITY_TEXTS, CONTENT_SELECTORS, TEXT_SELECTORS,
+    SEE_MORE_SELECTORS, TIMESTAMP_SELECTORS, REACTIONS_SELECTORS, COMMENTS_SELECTORS
+)
+from embedding_service import warm_embedding_service
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_cache import resolve_chromedriver
 
 # Load environment variables
 load_dotenv()
@@ -32,16 +47,251 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class LinkedInScraper:
+# Extracts the posts added to the feed since the last call in one
+# execute_async_script call: classifies original posts, expands truncated text,
+# then returns one record per post. Containers that have been handled are
+# tagged with data-lcg-seen so later passes skip them; empty placeholders are
+# left untagged until their content loads. Arguments are the selector lists
+# from feed_selectors, in order.
+EXTRACT_POSTS_SCRIPT = """
+    const [containerSelectors, activityTexts, contentSelectors, textSelectors,
+           seeMoreSelectors, timestampSelectors, reactionsSelectors, commentsSelectors] = arguments;
+    const done = arguments[arguments.length - 1];
+
+    const firstText = (root, selectors) => {
+        for (const selector of selectors) {
+            const el = root.querySelector(selector);
+            if (el && el.innerText.trim()) return el.innerText.trim();
+        }
+        return null;
+    };
+    const parseCount = (text) => {
+        if (!text) return null;
+        const match = text.replace(/,/g, '').match(/([\\d.]+)\\s*([KkMm]?)/);
+        if (!match) return null;
+        const scale = {k: 1e3, m: 1e6}[match[2].toLowerCase()] || 1;
+        return Math.round(parseFloat(match[1]) * scale);
+    };
+    const isOriginal = (container) => {
+        const text = container.innerText.toLowerCase();
+        for (const activity of activityTexts) {
+            if (text.startsWith(activity) || text.slice(0, 50).includes('\\n' + activity)) return false;
+        }
+        return contentSelectors.some(selector =>
+            Array.from(container.querySelectorAll(selector)).some(el => el.innerText.trim()));
+    };
+
+    let containers = [];
+    for (const selector of containerSelectors) {
+        containers = Array.from(document.querySelectorAll(selector));
+        if (containers.length) break;
+    }
+
+    // Only visit containers added (or filled in) since the previous pass
+    const fresh = containers.filter(container => !container.hasAttribute('data-lcg-seen'));
+    const originals = [];
+    for (const container of fresh) {
+        if (!container.innerText.trim()) continue;
+        if (isOriginal(container)) {
+            originals.push(container);
+        } else {
+            container.setAttribute('data-lcg-seen', 'activity');
+        }
+    }
+
+    // Expand every truncated post in this pass, then read once the DOM has updated
+    let expanded = 0;
+    for (const container of originals) {
+        if (container.hasAttribute('data-lcg-expanded')) continue;
+        for (const selector of seeMoreSelectors) {
+            for (const button of container.querySelectorAll(selector)) {
+                if (button.offsetWidth > 0 && button.offsetHeight > 0) {
+                    try { button.click(); expanded++; } catch (e) {}
+                }
+            }
+        }
+        container.setAttribute('data-lcg-expanded', 'extract');
+    }
+
+    const collect = () => {
+        const records = originals.map(container => {
+            let text = '';
+            for (const selector of textSelectors) {
+                for (const el of container.querySelectorAll(selector)) {
+                    const candidate = el.innerText.trim();
+                    if (candidate.length > text.length) text = candidate;
+                }
+            }
+            if (!text) {
+                text = Array.from(container.querySelectorAll('p, span.break-words, div.break-words'))
+                    .filter(el => el.textContent.trim() && el.offsetWidth > 0 && el.offsetHeight > 0)
+                    .map(el => el.textContent.trim())
+                    .join('\\n');
+            }
+            if (text.trim().length >= 10) container.setAttribute('data-lcg-seen', 'post');
+            const urnHolder = container.matches('[data-urn]') ? container
+                : (container.querySelector('[data-urn]') || container.closest('[data-urn]'));
+            return {
+                text: text,
+                post_urn: urnHolder ? urnHolder.getAttribute('data-urn') : null,
+                timestamp_text: firstText(container, timestampSelectors),
+                reactions: parseCount(firstText(container, reactionsSelectors)),
+                comments: parseCount(firstText(container, commentsSelectors))
+            };
+        });
+        done({records: records, containers: containers.length, fresh: fresh.length, expanded: expanded});
+    };
+
+    if (expanded) {
+        requestAnimationFrame(() => requestAnimationFrame(collect));
+    } else {
+        collect();
+    }
+"""
+
+# Clicks "see more" in every post container not yet marked data-lcg-expanded
+# (or only in the container passed as the third argument). Known button
+# selectors are tried first; otherwise only short button-like elements whose
+# own text reads "…more"/"see more" are clicked (never parents).
+EXPAND_SEE_MORE_SCRIPT = """
+    const [containerSelectors, seeMoreSelectors, onlyContainer] = arguments;
+    const visible = el => el.offsetWidth > 0 && el.offsetHeight > 0;
+    const looksLikeSeeMore = el => {
+        const text = (el.textContent || '').trim().toLowerCase();
+        return text.length <= 20 && (text.endsWith('…more') || text.endsWith('...more') || text === 'see more');
+    };
+
+    let containers = [];
+    if (onlyContainer) {
+        containers = onlyContainer.hasAttribute('data-lcg-expanded') ? [] : [onlyContainer];
+    } else {
+        for (const selector of containerSelectors) {
+            containers = Array.from(document.querySelectorAll(selector + ':not([data-lcg-expanded])'));
+            if (containers.length || document.querySelector(selector)) break;
+        }
+    }
+
+    let expanded = 0;
+    for (const container of containers) {
+        let buttons = [];
+        for (const selector of seeMoreSelectors) {
+            buttons.push(...container.querySelectorAll(selector));
+        }
+        if (!buttons.length) {
+            buttons = Array.from(container.querySelectorAll('button, a[role="button"], span[role="button"]')).filter(looksLikeSeeMore);
+        }
+
+        let clicked = false;
+        for (const button of buttons) {
+            if (!visible(button)) continue;
+            try { button.click(); clicked = true; } catch (e) {}
+        }
+        if (clicked) expanded++;
+
+        // Don't re-scan posts that are expanded (or never had anything to expand)
+        if (container.innerText.trim()) container.setAttribute('data-lcg-expanded', clicked ? 'clicked' : 'none');
+    }
+
+    return {containers: containers.length, expanded: expanded};
+"""
+
+# Scrolls the last post container into view, which is what triggers the next
+# page load whatever the post heights; returns the container count beforehand.
+# The scroll time is recorded for FEED_GROWTH_SCRIPT's idle measure.
+SCROLL_TO_LAST_POST_SCRIPT = """
+    window.__lcgScrollAt = performance.now();
+    let containers = [];
+    for (const selector of arguments[0]) {
+        containers = document.querySelectorAll(selector);
+        if (containers.length) break;
+    }
+    if (containers.length) {
+        containers[containers.length - 1].scrollIntoView({block: 'end'});
+    } else {
+        window.scrollBy(0, window.innerHeight);
+    }
+    return containers.length;
+"""
+
+# Returns the outerHTML of post containers not handed to the snapshot parser
+# yet and tags them data-lcg-snapshot, so each scroll parses only new markup.
+# Containers still waiting for their content are left for a later pass; an
+# ancestor's data-urn is carried over onto a wrapper so the URN isn't lost.
+NEW_CONTAINERS_HTML_SCRIPT = """
+    let containers = [];
+    for (const selector of arguments[0]) {
+        containers = document.querySelectorAll(selector);
+        if (containers.length) break;
+    }
+    const fragments = [];
+    for (const container of containers) {
+        if (container.hasAttribute('data-lcg-snapshot') || !container.innerText.trim()) continue;
+        container.setAttribute('data-lcg-snapshot', '1');
+        const urnHolder = container.hasAttribute('data-urn') ? null : container.closest('[data-urn]');
+        fragments.push(urnHolder
+            ? '<div data-urn="' + urnHolder.getAttribute('data-urn').replace(/"/g, '&quot;') + '">' + container.outerHTML + '</div>'
+            : container.outerHTML);
+    }
+    return {containers: containers.length, fragments: fragments};
+"""
+
+# Stop scrolling once this many already-stored posts have been seen
+# (more than one, so an old pinned post at the top doesn't end the scrape)
+HIGH_WATER_STOP_MATCHES = 2
+
+# Resources never needed for text extraction; blocked in lean mode via CDP
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*media.licdn.com/dms/image*", "*media.licdn.com/playlist*", "*static.licdn.com/aero-v1/sc/h/*.woff*"
+]
+
+# Copies localStorage so it can be restored together with the cookies
+EXPORT_LOCAL_STORAGE_SCRIPT = """
+    const items = {};
+    for (let i = 0; i < window.localStorage.length; i++) {
+        const key = window.localStorage.key(i);
+        items[key] = window.localStorage.getItem(key);
+    }
+    return items;
+"""
+
+IMPORT_LOCAL_STORAGE_SCRIPT = """
+    const items = arguments[0];
+    for (const key in items) window.localStorage.setItem(key, items[key]);
+"""
+
+# Counts the requests the current document has made and sums their transfer
+# size. transferSize is 0 for cross-origin responses without
+# Timing-Allow-Origin, so these bytes cover same-origin resources only; the
+# scraper prefers the DevTools byte count (see read_network_bytes)
+PAGE_TRAFFIC_SCRIPT = """
+    const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+    let bytes = 0;
+    for (const entry of entries) bytes += entry.transferSize || 0;
+    return {requests: entries.length, bytes: bytes};
+"""
+
+class LinkedInScraper(PostStorageMixin):
     # Add this complete __init__ method to your LinkedInScraper class:
 
-    def __init__(self, headless=False, debug=True, max_posts=50, chroma_db_path="chroma_db"):
+    def __init__(self, headless=False, debug=True, max_posts=50, chroma_db_path="chroma_db", embedding_service=None, incremental=True, extraction_mode="js", lean=True, session_path=None, user_data_dir=None, resume_session=True, collection=None, warm_model=False, streaming_save=True, replay_logs=True, base_url=None, max_profiles_per_browser=None, max_browser_rss_mb=None):
         """Initialize the LinkedIn scraper with login credentials and ChromaDB."""
         
         # Set instance variables
         self.headless = headless
         self.debug = debug
         self.max_posts = max_posts
+        self.incremental = incremental
+        self.extraction_mode = extraction_mode  # "js" (one script call per pass), "snapshot" (parse page_source offline) or "dom" (per-element WebDriver calls)
+        self.lean = lean  # block images, video and fonts
+        self.user_data_dir = user_data_dir or os.getenv('LINKEDIN_CHROME_PROFILE')
+        # Site root; point it at replay_server to run against a local stand-in
+        self.base_url = (base_url or os.getenv('LINKEDIN_BASE_URL') or 'https://www.linkedin.com').rstrip('/')
+        self.streaming_save = streaming_save  # embed and store batches while scrolling
+        self._save_pipeline = None
+        self.pipeline_stats = {}
         self.logged_in = False
         self.session_id = str(uuid4())[:8]
         
@@ -52,11 +302,66 @@ class LinkedInScraper:
         if not self.email or not self.password:
             raise ValueError("LinkedIn credentials not found in environment variables")
         
+        # Encrypted cookies/localStorage from the last successful login
+        self.session_store = SessionStore(session_path or os.path.join(chroma_db_path, SESSION_FILENAME), self.email, self.password)
+        
+        # Cold-start time per phase, in seconds
+        self.startup_timings = {}
+        
         # Create debug directory
         if self.debug:
             os.makedirs('debug', exist_ok=True)
         
+        # Browser recycling: restart Chrome after this many profiles or once it
+        # uses this much memory (0 disables either limit, None reads the environment)
+        self.recycle_policy = RecyclePolicy(max_profiles_per_browser, max_browser_rss_mb)
+        self.healthy = True  # False once a relaunch has failed; the owner should replace this scraper
+        self.lifecycle_stats = {
+            'restarts': 0, 'profiles_scraped': 0, 'profiles_since_restart': 0,
+            'rss_mb': None, 'peak_rss_mb': None, 'restart_s': 0.0, 'last_restart_reason': None
+        }
+        
         # Initialize WebDriver
+        self.start_driver()
+        
+        # Lazily opened ChromaDB collection, embedding model and scrape log
+        self.init_storage(chroma_db_path, collection, embedding_service, replay_logs)
+        
+        if warm_model:
+            # Load the model on a background thread while the browser logs in and scrolls
+            if embedding_service is None:
+                warm_embedding_service(background=True)
+            elif not embedding_service.is_loaded:
+                threading.Thread(target=embedding_service.warm, name="embedding-warmup", daemon=True).start()
+        
+        # Newest stored posts per profile, so refreshes stop at known content
+        self.high_water_marks = get_high_water_marks(chroma_db_path)
+        self.feed_fingerprints = []
+        self.last_scrape = {}  # Outcome of the last scrape_profile call (stop reason, posts seen)
+        
+        # Post containers already handled by the DOM extraction path
+        self.seen_post_elements = set()
+        
+        # Scroll decisions and posts/s for the current profile
+        self.scroll_controller = None
+        self.cancel_event = None  # threading.Event an owner can set to stop the current scroll early
+        
+        # Totals for expand_all_see_more
+        self.expansion_stats = {'calls': 0, 'containers_checked': 0, 'expanded': 0, 'total_s': 0.0}
+        
+        # Bytes and requests per scraped profile page
+        self.traffic_stats = {'pages': 0, 'requests': 0, 'bytes': 0, 'bytes_source': None}
+        
+        # Resume the previous session now so scrapes don't have to log in
+        if resume_session:
+            phase_start = time.perf_counter()
+            self.restore_session()
+            self.startup_timings['session_restore'] = time.perf_counter() - phase_start
+        
+        logger.info("Scraper cold start: " + ", ".join(f"{phase} {elapsed:.2f}s" for phase, elapsed in self.startup_timings.items()))
+    
+    def start_driver(self):
+        """Launch Chrome through chromedriver; sets driver, wait and waiter."""
         chrome_options = Options()
         if self.headless:
             chrome_options.add_argument('--headless')
@@ -65,39 +370,187 @@ class LinkedInScraper:
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--window-size=1920,1080')
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        # DevTools network events, for byte counts that include cross-origin responses
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        if self.user_data_dir:
+            # A persistent Chrome profile keeps the login between runs by itself
+            chrome_options.add_argument(f'--user-data-dir={os.path.abspath(self.user_data_dir)}')
+        if self.lean:
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            chrome_options.add_argument('--autoplay-policy=user-gesture-required')
+            chrome_options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.default_content_setting_values.notifications': 2
+            })
         
+        # Restarts are timed in lifecycle_stats; startup_timings stays the cold start
+        timings = self.startup_timings if not hasattr(self, 'driver') else {}
         try:
-            service = Service(ChromeDriverManager().install())
+            phase_start = time.perf_counter()
+            service = Service(resolve_chromedriver())
+            timings['driver_resolve'] = time.perf_counter() - phase_start
+            
+            phase_start = time.perf_counter()
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            timings['browser_launch'] = time.perf_counter() - phase_start
+            if self.lean:
+                self.enable_request_blocking()
             self.wait = WebDriverWait(self.driver, 20)
+            # Keep the wait totals across browser restarts
+            if hasattr(self, 'waiter'):
+                self.waiter.driver = self.driver
+            else:
+                self.waiter = PageWaiter(self.driver, timeout=20)
             logger.info("WebDriver initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize WebDriver: {str(e)}")
             raise e
+    
+    def get_browser_rss(self):
+        """Resident memory of chromedriver and every Chrome process under it, in MB (None without psutil)."""
+        try:
+            return process_tree_rss_mb(self.driver.service.process.pid)
+        except Exception as e:
+            logger.error(f"Error reading browser memory: {str(e)}")
+            return None
+    
+    def record_browser_usage(self):
+        """Count a scraped profile and sample the browser's memory."""
+        self.lifecycle_stats['profiles_scraped'] += 1
+        self.lifecycle_stats['profiles_since_restart'] += 1
+        rss = self.get_browser_rss()
+        if rss is not None:
+            self.lifecycle_stats['rss_mb'] = rss
+            self.lifecycle_stats['peak_rss_mb'] = max(rss, self.lifecycle_stats['peak_rss_mb'] or 0)
+        return rss
+    
+    def restart_browser(self, reason="manual"):
+        """Replace the browser with a fresh one and carry the login over; return True if still logged in.
         
-        # Add ChromaDB initialization
-        self.chroma_db_path = chroma_db_path
-        self.chroma_client = chromadb.PersistentClient(path=chroma_db_path)
+        Raises BrowserUnavailableError (and marks the scraper unhealthy) if no new browser starts.
+        """
+        start = time.perf_counter()
+        logger.info(f"Restarting browser ({reason}) after {self.lifecycle_stats['profiles_since_restart']} profiles")
         
-        # Initialize sentence transformer for embeddings
-        logger.info("Loading sentence transformer model...")
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        logger.info("Sentence transformer model loaded successfully")
+        # Persist the session first; keep a copy in memory in case the session store is unavailable
+        was_logged_in = self.logged_in
+        cookies, local_storage = [], None
+        if was_logged_in:
+            try:
+                self.save_session()
+                cookies = self.export_cookies()
+                local_storage = self.driver.execute_script(EXPORT_LOCAL_STORAGE_SCRIPT)
+            except Exception as e:
+                logger.warning(f"Could not export the session before restarting: {str(e)}")
         
-        # Initialize or get collection
         try:
-            self.collection = self.chroma_client.get_collection(name="posts_collection")
-            logger.info("Connected to existing ChromaDB collection")
-        except:
-            self.collection = self.chroma_client.create_collection(name="posts_collection")
-            logger.info("Created new ChromaDB collection")
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting the old browser: {str(e)}")
+        
+        self.logged_in = False
+        for attempt in range(1, RELAUNCH_ATTEMPTS + 1):
+            try:
+                self.start_driver()
+                break
+            except Exception as e:
+                logger.error(f"Browser relaunch attempt {attempt}/{RELAUNCH_ATTEMPTS} failed: {str(e)}")
+        else:
+            self.healthy = False
+            raise BrowserUnavailableError(f"Could not relaunch the browser after {RELAUNCH_ATTEMPTS} attempts")
+        
+        if was_logged_in and not self.restore_session() and not (cookies and self.import_cookies(cookies, local_storage)):
+            # Neither copy of the session was accepted; log in again rather than scrape logged out
+            logger.warning("Session was not carried over to the new browser, logging in again")
+            self.ensure_logged_in()
+        
+        elapsed = time.perf_counter() - start
+        self.lifecycle_stats['restarts'] += 1
+        self.lifecycle_stats['profiles_since_restart'] = 0
+        self.lifecycle_stats['restart_s'] += elapsed
+        self.lifecycle_stats['last_restart_reason'] = reason
+        self.lifecycle_stats['rss_mb'] = self.get_browser_rss()
+        logger.info(f"Browser restarted in {elapsed:.1f}s (logged in: {self.logged_in})")
+        return self.logged_in
+    
+    def maybe_recycle_browser(self):
+        """Restart the browser if it has scraped too many profiles or grown past the memory ceiling."""
+        reason = self.recycle_policy.check(self.lifecycle_stats['profiles_since_restart'], self.lifecycle_stats['rss_mb'])
+        if reason:
+            self.restart_browser(reason)
+        return reason
+    
+    def enable_request_blocking(self):
+        """Block image, video and font requests through the DevTools protocol."""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+            # Keep every resource entry so the traffic counter sees the whole page
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                'source': 'performance.setResourceTimingBufferSize(10000);'
+            })
+            logger.info(f"Blocking {len(BLOCKED_URL_PATTERNS)} resource URL patterns")
+        except Exception as e:
+            logger.warning(f"Could not enable request blocking: {str(e)}")
+    
+    def read_network_bytes(self):
+        """Sum the encoded bytes of every response finished since the last call, or None if unavailable.
+        
+        Reads (and so drains) Chrome's performance log. Unlike Resource Timing,
+        Network.loadingFinished counts cross-origin responses too.
+        """
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"Performance log unavailable: {str(e)}")
+            return None
+        
+        total = 0
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            if message.get('method') == 'Network.loadingFinished':
+                total += message.get('params', {}).get('encodedDataLength', 0)
+        return total
+    
+    def get_page_traffic(self):
+        """Return the requests made and bytes transferred by the current page.
+        
+        'bytes_source' is 'devtools' when the bytes come from the performance
+        log, or 'same_origin' when only Resource Timing was available.
+        """
+        try:
+            traffic = self.driver.execute_script(PAGE_TRAFFIC_SCRIPT)
+        except Exception as e:
+            logger.error(f"Error reading page traffic: {str(e)}")
+            traffic = {'requests': 0, 'bytes': 0}
+        
+        network_bytes = self.read_network_bytes()
+        if network_bytes is None:
+            traffic['bytes_source'] = 'same_origin'
+        else:
+            traffic['bytes'] = network_bytes
+            traffic['bytes_source'] = 'devtools'
+        return traffic
+    
+    def record_page_traffic(self, profile_url):
+        """Add the current page's traffic to the totals and log it."""
+        traffic = self.get_page_traffic()
+        self.traffic_stats['pages'] += 1
+        self.traffic_stats['requests'] += traffic['requests']
+        self.traffic_stats['bytes'] += traffic['bytes']
+        self.traffic_stats['bytes_source'] = traffic['bytes_source']
+        logger.info(f"Page traffic for {profile_url}: {traffic['requests']} requests, {traffic['bytes'] / 1024:.0f} KB ({traffic['bytes_source']})")
+        return traffic
         
     def login(self):
         """Log in to LinkedIn."""
         try:
             logger.info("Navigating to LinkedIn login page")
-            self.driver.get('https://www.linkedin.com/login')
-            time.sleep(3)
+            self.driver.get(f'{self.base_url}/login')
+            self.waiter.wait_for_page_ready("login_page")
             
             # Take screenshot of login page
             if self.debug:
@@ -129,8 +582,8 @@ class LinkedInScraper:
                 if self.debug:
                     self.driver.save_screenshot(f'debug/{self.session_id}_after_login.png')
                 
-                # Wait a bit after login
-                time.sleep(5)
+                # Let the post-login redirects and home feed settle
+                self.waiter.wait_for_settled("after_login", quiet_ms=500, timeout=5)
                 
             except TimeoutException:
                 # Check if we got a security verification page
@@ -151,10 +604,91 @@ class LinkedInScraper:
                 self.driver.save_screenshot(f'debug/{self.session_id}_login_error.png')
             raise e
     
+    def ensure_logged_in(self):
+        """Resume a saved session if possible, and only fill in the login form when it has expired."""
+        if self.logged_in or self.restore_session():
+            return True
+        self.login()
+        if self.logged_in:
+            self.save_session()
+        return self.logged_in
+    
+    def validate_session(self):
+        """Load the feed and report whether the browser is logged in."""
+        self.driver.get(f'{self.base_url}/feed/')
+        try:
+            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, 'global-nav')))
+            self.logged_in = True
+        except TimeoutException:
+            self.logged_in = False
+        return self.logged_in
+    
+    def restore_session(self):
+        """Reuse the Chrome profile's login or the encrypted saved session; return True if logged in."""
+        try:
+            if self.user_data_dir and self.validate_session():
+                logger.info("Resumed LinkedIn session from the Chrome profile")
+                return True
+            
+            state = self.session_store.load()
+            if not state:
+                return False
+            
+            if self.import_cookies(state.get('cookies', []), state.get('local_storage')):
+                logger.info(f"Resumed LinkedIn session saved at {state.get('saved_at')}")
+                return True
+            
+            # LinkedIn no longer accepts it; don't try it again next time
+            self.session_store.clear()
+            return False
+            
+        except Exception as e:
+            logger.error(f"Error restoring session: {str(e)}")
+            return False
+    
+    def save_session(self):
+        """Write the current cookies and localStorage to the encrypted session file."""
+        try:
+            if not self.logged_in:
+                return False
+            return self.session_store.save(self.export_cookies(), self.driver.execute_script(EXPORT_LOCAL_STORAGE_SCRIPT))
+        except Exception as e:
+            logger.error(f"Error saving session: {str(e)}")
+            return False
+    
+    def export_cookies(self):
+        """Return the browser's LinkedIn cookies so another browser can reuse this login."""
+        return self.driver.get_cookies() if self.logged_in else []
+    
+    def import_cookies(self, cookies, local_storage=None):
+        """Load cookies (and optionally localStorage) from another session and check that it is valid."""
+        try:
+            # Cookies can only be set for the domain currently loaded
+            self.driver.get(f'{self.base_url}/')
+            for cookie in cookies:
+                cookie = {key: value for key, value in cookie.items() if key != 'sameSite'}
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception:
+                    continue
+            if local_storage:
+                self.driver.execute_script(IMPORT_LOCAL_STORAGE_SCRIPT, local_storage)
+            
+            if self.validate_session():
+                logger.info("Reused existing LinkedIn session")
+            else:
+                logger.warning("Imported session is not valid")
+            
+            return self.logged_in
+            
+        except Exception as e:
+            logger.error(f"Error importing cookies: {str(e)}")
+            return False
+    
     def navigate_to_profile(self, profile_url):
         """Navigate to a LinkedIn profile and ensure it's loaded."""
         if not self.logged_in:
-            self.login()
+            self.ensure_logged_in()
         
         try:
             # Ensure URL is the recent-activity/all page
@@ -167,7 +701,7 @@ class LinkedInScraper:
             self.driver.get(profile_url)
             
             # Wait for page to load
-            time.sleep(5)
+            self.waiter.wait_for_page_ready("profile_page")
             
             # Take screenshot of profile page
             if self.debug:
@@ -183,7 +717,7 @@ class LinkedInScraper:
                 logger.info(f"Trying fallback URL: {fallback_url}")
                 
                 self.driver.get(fallback_url)
-                time.sleep(5)
+                self.waiter.wait_for_page_ready("fallback_page")
                 
                 if self.debug:
                     self.driver.save_screenshot(f'debug/{self.session_id}_fallback_page.png')
@@ -195,20 +729,15 @@ class LinkedInScraper:
             
             # Wait for content to load
             try:
-                # Wait for any of these elements that indicate posts are loaded
-                selectors = [
-                    ".occludable-update",
-                    ".feed-shared-update-v2",
-                    ".profile-creator-shared-feed-update__container"
-                ]
-                
-                for selector in selectors:
-                    try:
-                        self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                        logger.info(f"Found posts with selector: {selector}")
-                        return True
-                    except:
-                        continue
+                # Wait for any element that indicates posts are loaded, in one wait
+                # (one wait per selector spent the full timeout on each missing one)
+                found = self.waiter.wait_until(
+                    lambda driver: driver.find_elements(By.CSS_SELECTOR, ", ".join(POST_CONTAINER_SELECTORS)),
+                    "profile_posts"
+                )
+                if found:
+                    logger.info(f"Found {len(found)} post containers")
+                    return True
                 
                 logger.warning("Could not find any post elements")
                 if self.debug:
@@ -230,7 +759,7 @@ class LinkedInScraper:
         """Scroll to the top of the page."""
         try:
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(2)
+            self.waiter.wait_for_settled("scroll_to_top", timeout=2)
             logger.info("Scrolled to top of page")
             return True
         except Exception as e:
@@ -280,11 +809,11 @@ class LinkedInScraper:
                     
                     logger.info(f"Navigating back to posts page: {posts_url}")
                     self.driver.get(posts_url)
-                    time.sleep(3)  # Give time to load
+                    self.waiter.wait_for_page_ready("return_to_posts")
                     
                     # Scroll back to where we were (roughly)
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                    time.sleep(2)
+                    self.waiter.wait_for_settled("return_to_posts_scroll", timeout=3)
                     
                     return False  # Not a real redirect, we handled it
                 except Exception as e:
@@ -337,8 +866,11 @@ class LinkedInScraper:
             logger.error(f"Error checking for redirect: {str(e)}")
             return False
     
-    def scroll_and_extract_incrementally(self, category, original_url, max_scrolls=10, profile_name_override=None):
-        """Scroll the page and extract posts incrementally. Stop if redirected but keep accumulated posts."""
+    def scroll_and_extract_incrementally(self, category, original_url, max_scrolls=MAX_SCROLLS, profile_name_override=None):
+        """Scroll the page and extract posts incrementally. Stop if redirected but keep accumulated posts.
+
+        Returns (posts, stop_reason); stop_reason is the scroll controller's, or "error".
+        """
         try:
             # First scroll to top
             self.scroll_to_top()
@@ -349,8 +881,16 @@ class LinkedInScraper:
             
             posts_loaded = set()  # Track unique posts to avoid counting duplicates
             self.accumulated_posts = []  # Reset accumulated posts for this profile
+            self.feed_fingerprints = []  # Fingerprints of every post seen, in feed order
+            self.seen_post_elements = set()  # Containers handled by earlier DOM extraction passes
             processed_texts = set()  # Track processed posts to avoid duplicates
             
+            # Fingerprints of the newest posts we already stored for this profile
+            known_fingerprints = self.high_water_marks.get(original_url) if self.incremental else set()
+            known_seen = 0
+            if known_fingerprints:
+                logger.info(f"Incremental scrape: {len(known_fingerprints)} known posts for this profile")
+            
             # Get profile name - use override if provided
             if profile_name_override:
                 profile_name = profile_name_override
@@ -359,9 +899,18 @@ class LinkedInScraper:
                 profile_name = self.extract_profile_name()
                 logger.info(f"Extracted profile name: {profile_name}")
             
-            # Scroll down gradually to load posts
-            for i in range(max_scrolls):
-                logger.info(f"Scroll {i+1}/{max_scrolls}")
+            # Scroll until the target is reached or the feed stops growing
+            controller = ScrollController(self.max_posts, max_scrolls)
+            self.scroll_controller = controller
+            while controller.should_continue(len(self.accumulated_posts)):
+                i = controller.scrolls
+                logger.info(f"Scroll {i+1} (budget {controller.scroll_budget()})")
+                
+                # The caller gave up on this profile; keep (and save) what we have
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    logger.warning(f"Scrape cancelled after {i} scrolls, keeping {len(self.accumulated_posts)} posts")
+                    controller.stop("cancelled", len(self.accumulated_posts))
+                    return self.accumulated_posts, controller.stop_reason
                 
                 # Check for redirect before continuing
                 if self.check_for_redirect(original_url):
@@ -369,7 +918,8 @@ class LinkedInScraper:
                     logger.info(f"Saving {len(self.accumulated_posts)} posts collected so far")
                     if self.debug:
                         self.driver.save_screenshot(f'debug/{self.session_id}_redirect_detected.png')
-                    return self.accumulated_posts  # Return what we have so far
+                    controller.stop("redirect", len(self.accumulated_posts))
+                    return self.accumulated_posts, controller.stop_reason  # Return what we have so far
                 
                 # Find all "see more" links and expand them
                 self.expand_all_see_more()
@@ -378,23 +928,32 @@ class LinkedInScraper:
                 current_batch_posts = self.extract_current_posts(category, profile_name, processed_texts)
                 
                 # Add new posts to accumulated posts
-                new_posts_count = 0
-                for post in current_batch_posts:
-                    if post['post_text'] not in processed_texts:
-                        self.accumulated_posts.append(post)
-                        processed_texts.add(post['post_text'])
-                        new_posts_count += 1
+                new_posts_count, known_count = self.accumulate_posts(current_batch_posts, original_url, processed_texts, known_fingerprints)
+                known_seen += known_count
                 
                 logger.info(f"Found {new_posts_count} new posts. Total accumulated: {len(self.accumulated_posts)}")
                 
                 # If we have enough posts, we can stop scrolling
                 if len(self.accumulated_posts) >= self.max_posts:
                     logger.info(f"Reached target of {self.max_posts} posts")
+                    controller.stop("target_reached", len(self.accumulated_posts))
                     break
                 
-                # Scroll down more aggressively for more posts
-                self.driver.execute_script("window.scrollBy(0, 800);")
-                time.sleep(3)
+                # Everything below the high-water mark is already stored
+                if known_seen >= HIGH_WATER_STOP_MATCHES:
+                    logger.info(f"Reached already-stored posts after {i+1} scrolls, stopping")
+                    controller.stop("high_water_mark", len(self.accumulated_posts))
+                    return self.accumulated_posts, controller.stop_reason
+                
+                # Jump to the last post so the next page starts loading
+                loaded_before = self.driver.execute_script(SCROLL_TO_LAST_POST_SCRIPT, POST_CONTAINER_SELECTORS)
+                growth = self.waiter.wait_for_feed_growth(", ".join(POST_CONTAINER_SELECTORS), loaded_before, "scroll")
+                # A timed-out wait is inconclusive, not "no growth"
+                controller.record_scroll(growth["grew"] if growth else None)
+                if controller.exhausted:
+                    logger.info(f"Feed exhausted after {controller.scrolls} scrolls")
+                elif controller.stalled:
+                    logger.info(f"Feed stopped responding after {controller.scrolls} scrolls")
                 
                 # Check for redirect after scrolling
                 if self.check_for_redirect(original_url):
@@ -402,7 +961,8 @@ class LinkedInScraper:
                     logger.info(f"Saving {len(self.accumulated_posts)} posts collected so far")
                     if self.debug:
                         self.driver.save_screenshot(f'debug/{self.session_id}_redirect_after_scroll.png')
-                    return self.accumulated_posts  # Return what we have so far
+                    controller.stop("redirect", len(self.accumulated_posts))
+                    return self.accumulated_posts, controller.stop_reason  # Return what we have so far
                 
                 # Every 3 scrolls, take a screenshot and check URL
                 if self.debug and i % 3 == 0:
@@ -415,21 +975,30 @@ class LinkedInScraper:
             if self.check_for_redirect(original_url):
                 logger.warning("Redirect detected during final expansion")
                 logger.info(f"Saving {len(self.accumulated_posts)} posts collected so far")
-                return self.accumulated_posts
+                controller.stop("redirect", len(self.accumulated_posts))
+                return self.accumulated_posts, controller.stop_reason
             
             # Final extraction
             final_batch_posts = self.extract_current_posts(category, profile_name, processed_texts)
-            for post in final_batch_posts:
-                if post['post_text'] not in processed_texts:
-                    self.accumulated_posts.append(post)
-                    processed_texts.add(post['post_text'])
+            self.accumulate_posts(final_batch_posts, original_url, processed_texts, known_fingerprints)
             
             # Take screenshot after scrolling
             if self.debug:
                 self.driver.save_screenshot(f'debug/{self.session_id}_after_scrolling.png')
             
             logger.info(f"Successfully completed scraping. Total posts: {len(self.accumulated_posts)}")
-            return self.accumulated_posts
+            for phase, stats in self.get_wait_stats().items():
+                logger.info(f"Waited {stats['total_s']:.1f}s in '{phase}' over {stats['waits']} waits ({stats['timeouts']} timeouts)")
+            logger.info(
+                f"Expanded {self.expansion_stats['expanded']} posts in {self.expansion_stats['calls']} passes "
+                f"({self.expansion_stats['total_s']:.2f}s)"
+            )
+            scroll_stats = self.get_scroll_stats()
+            logger.info(
+                f"Scrolled {scroll_stats['scrolls']} times ({scroll_stats['stop_reason']}): "
+                f"{scroll_stats['posts_per_scroll']:.1f} posts/scroll, {scroll_stats['posts_per_sec']:.2f} posts/s"
+            )
+            return self.accumulated_posts, controller.stop_reason
             
         except Exception as e:
             logger.error(f"Error during scrolling: {str(e)}")
@@ -437,17 +1006,51 @@ class LinkedInScraper:
                 self.driver.save_screenshot(f'debug/{self.session_id}_scrolling_error.png')
             # Even on error, return what we have accumulated
             logger.info(f"Returning {len(self.accumulated_posts)} posts despite error")
-            return self.accumulated_posts
+            return self.accumulated_posts, "error"
+    
+    def accumulate_posts(self, batch_posts, original_url, processed_texts, known_fingerprints):
+        """Add unseen posts from a batch to accumulated_posts, skipping already-stored ones.
+        
+        Returns (new_posts_count, known_posts_count).
+        """
+        new_posts_count = 0
+        known_posts_count = 0
+        new_posts = []
+        
+        for post in batch_posts:
+            if post['post_text'] in processed_texts:
+                continue
+            processed_texts.add(post['post_text'])
+            
+            fingerprint = make_post_id(original_url, post['post_text'])
+            self.feed_fingerprints.append(fingerprint)
+            
+            if fingerprint in known_fingerprints:
+                known_posts_count += 1
+                continue
+            
+            self.accumulated_posts.append(post)
+            new_posts.append(post)
+            new_posts_count += 1
+        
+        self.scrape_log.append_posts(new_posts, original_url)
+        
+        # Hand the batch to the background saver so encoding overlaps scrolling
+        if self._save_pipeline is not None:
+            self._save_pipeline.submit(new_posts)
+        
+        return new_posts_count, known_posts_count
     
     def extract_current_posts(self, category, profile_name, processed_texts):
         """Extract posts currently visible on the page."""
+        if self.extraction_mode == "js":
+            return self.extract_current_posts_js(category, profile_name, processed_texts)
+        if self.extraction_mode == "snapshot":
+            return self.extract_current_posts_snapshot(category, profile_name, processed_texts)
+        
         try:
             # Find all post containers
-            post_selectors = [
-                ".feed-shared-update-v2",
-                ".occludable-update",
-                ".profile-creator-shared-feed-update__container"
-            ]
+            post_selectors = POST_CONTAINER_SELECTORS
             
             all_posts = []
             for selector in post_selectors:
@@ -459,18 +1062,28 @@ class LinkedInScraper:
             if not all_posts:
                 return []
             
+            # Only visit containers we haven't handled in an earlier pass
+            new_posts = [post for post in all_posts if post.id not in self.seen_post_elements]
+            logger.info(f"Processing {len(new_posts)} new of {len(all_posts)} post containers")
+            
             # Extract data from each post
             post_data = []
             
-            for i, post in enumerate(all_posts):
+            for i, post in enumerate(new_posts):
                 try:
                     # Check if this is an original post
                     if not self.is_original_post(post):
+                        if post.text.strip():
+                            self.seen_post_elements.add(post.id)
                         continue
                     
                     # Extract post data
                     post_text = self.extract_post_text(post)
                     
+                    # Leave posts without text yet for the next pass
+                    if len(post_text.strip()) >= 10:
+                        self.seen_post_elements.add(post.id)
+                    
                     # Skip if we've already processed this text or it's too short
                     if post_text in processed_texts or len(post_text.strip()) < 10:
                         continue
@@ -492,14 +1105,86 @@ class LinkedInScraper:
             logger.error(f"Error extracting current posts: {str(e)}")
             return []
     
+    def capture_snapshot(self, path):
+        """Save the current page's HTML (tagged with its URL) for offline extraction."""
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"<!-- lcg-snapshot-url: {self.driver.current_url} -->\n")
+                f.write(self.driver.page_source)
+            return path
+        except Exception as e:
+            logger.error(f"Error capturing page snapshot: {str(e)}")
+            return None
+    
+    def extract_current_posts_snapshot(self, category, profile_name, processed_texts):
+        """Extract posts by parsing container markup with snapshot_extraction instead of querying the live DOM.
+        
+        Only containers added since the previous pass are fetched and parsed,
+        so the cost per scroll stays flat as the feed grows.
+        """
+        try:
+            page = self.driver.execute_script(NEW_CONTAINERS_HTML_SCRIPT, POST_CONTAINER_SELECTORS)
+            if not page['fragments']:
+                return []
+            html = "<html><body>" + "".join(page['fragments']) + "</body></html>"
+            result = parse_snapshot(html, category=category, profile_name=profile_name, page_url=self.driver.current_url)
+            post_data = [post for post in result['posts'] if post['post_text'] not in processed_texts]
+            logger.info(f"Snapshot extraction: {len(post_data)} new posts from {len(page['fragments'])} new of {page['containers']} containers")
+            return post_data
+        except Exception as e:
+            logger.error(f"Error extracting posts from page snapshot: {str(e)}")
+            return []
+    
+    def extract_current_posts_js(self, category, profile_name, processed_texts):
+        """Extract posts currently on the page with a single execute_async_script round trip."""
+        try:
+            result = self.driver.execute_async_script(
+                EXTRACT_POSTS_SCRIPT,
+                POST_CONTAINER_SELECTORS,
+                ACTIVITY_TEXTS,
+                CONTENT_SELECTORS,
+                TEXT_SELECTORS,
+                SEE_MORE_SELECTORS,
+                TIMESTAMP_SELECTORS,
+                REACTIONS_SELECTORS,
+                COMMENTS_SELECTORS
+            )
+            
+            post_data = []
+            for record in result['records']:
+                # Same clean-up as extract_post_text
+                post_text = re.sub(r'\n\s*\n', '\n\n', record['text'] or '')
+                post_text = re.sub(r' +', ' ', post_text).strip()
+                
+                # Skip if we've already processed this text or it's too short
+                if post_text in processed_texts or len(post_text) < 10:
+                    continue
+                
+                post = {
+                    'profile_name': profile_name,
+                    'post_text': post_text,
+                    'category': category
+                }
+                for key in ('post_urn', 'timestamp_text', 'reactions', 'comments'):
+                    if record.get(key) is not None:
+                        post[key] = record[key]
+                post_data.append(post)
+            
+            logger.info(
+                f"JS extraction: {result['fresh']} new of {result['containers']} containers, "
+                f"{len(result['records'])} original, {result['expanded']} expanded"
+            )
+            return post_data
+            
+        except Exception as e:
+            logger.error(f"Error extracting current posts with JavaScript: {str(e)}")
+            return []
+    
     def count_loaded_posts(self):
         """Count the number of posts currently loaded on the page."""
         try:
-            post_selectors = [
-                ".feed-shared-update-v2",
-                ".occludable-update",
-                ".profile-creator-shared-feed-update__container"
-            ]
+            post_selectors = POST_CONTAINER_SELECTORS
             
             max_count = 0
             for selector in post_selectors:
@@ -511,86 +1196,25 @@ class LinkedInScraper:
             return 0
     
     def expand_all_see_more(self):
-        """Find and click all 'see more' links on the page."""
+        """Expand truncated text in post containers that haven't been expanded yet, in one script call."""
         try:
-            # Find all elements that might be "see more" buttons
-            see_more_selectors = [
-                ".inline-show-more-text__button",
-                ".feed-shared-inline-show-more-text__see-more",
-                ".feed-shared-text-view__see-more",
-                ".see-more",
-                "span.lt-line-clamp__more"
-            ]
+            start = time.perf_counter()
+            result = self.driver.execute_script(
+                EXPAND_SEE_MORE_SCRIPT,
+                POST_CONTAINER_SELECTORS,
+                SEE_MORE_SELECTORS
+            )
+            elapsed = time.perf_counter() - start
             
-            for selector in see_more_selectors:
-                try:
-                    see_more_buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    logger.info(f"Found {len(see_more_buttons)} potential 'see more' buttons with selector: {selector}")
-                    
-                    for button in see_more_buttons:
-                        try:
-                            if button.is_displayed():
-                                # Try to scroll to the button
-                                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
-                                time.sleep(1)
-                                
-                                # Try JavaScript click
-                                try:
-                                    self.driver.execute_script("arguments[0].click();", button)
-                                    logger.info("Expanded post with JS click")
-                                    time.sleep(1)
-                                except:
-                                    # Try regular click
-                                    try:
-                                        button.click()
-                                        logger.info("Expanded post with regular click")
-                                        time.sleep(1)
-                                    except:
-                                        pass
-                        except:
-                            continue
-                except:
-                    continue
+            self.expansion_stats['calls'] += 1
+            self.expansion_stats['containers_checked'] += result['containers']
+            self.expansion_stats['expanded'] += result['expanded']
+            self.expansion_stats['total_s'] += elapsed
+            
+            if result['expanded'] > 0:
+                logger.info(f"Expanded {result['expanded']} posts ({result['containers']} containers checked) in {elapsed * 1000:.0f}ms")
+                self.waiter.wait_for_settled("expand_see_more", timeout=3)
             
-            # Also try a more aggressive approach with JavaScript
-            try:
-                expanded_count = self.driver.execute_script("""
-                    const expandButtons = [];
-                    
-                    // Find all elements containing "...more" or "see more" text
-                    const allElements = document.querySelectorAll('*');
-                    for (const el of allElements) {
-                        const text = el.textContent;
-                        if ((text.includes('…more') || 
-                             text.includes('...more') || 
-                             text.toLowerCase().includes('see more')) && 
-                            el.offsetWidth > 0 && 
-                            el.offsetHeight > 0) {
-                            
-                            try {
-                                el.click();
-                                expandButtons.push(el);
-                            } catch (e) {
-                                // Try parent element
-                                try {
-                                    el.parentElement.click();
-                                    expandButtons.push(el.parentElement);
-                                } catch (e2) {
-                                    // Ignore
-                                }
-                            }
-                        }
-                    }
-                    
-                    return expandButtons.length;
-                """)
-                
-                if expanded_count > 0:
-                    logger.info(f"Expanded {expanded_count} 'see more' buttons with JavaScript")
-                    time.sleep(2)
-            except:
-                pass
-                
             return True
             
         except Exception as e:
@@ -605,14 +1229,10 @@ class LinkedInScraper:
             
             # First, scroll to top to ensure we start from the top (most recent posts)
             self.scroll_to_top()
-            time.sleep(3)  # Give page time to load top content
+            self.waiter.wait_for_settled("load_top_content", timeout=3)  # Give page time to load top content
             
             # Find all post containers - increased limit to get more posts
-            post_selectors = [
-                ".feed-shared-update-v2",
-                ".occludable-update",
-                ".profile-creator-shared-feed-update__container"
-            ]
+            post_selectors = POST_CONTAINER_SELECTORS
             
             all_posts = []
             for selector in post_selectors:
@@ -653,8 +1273,8 @@ class LinkedInScraper:
                     
                     # Scroll to the post to ensure it's in view
                     try:
-                        self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", post)
-                        time.sleep(1)
+                        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", post)
+                        self.waiter.wait_for_settled("scroll_to_post", quiet_ms=200, timeout=1)
                     except:
                         logger.warning(f"Could not scroll to post {i+1}")
                     
@@ -709,10 +1329,7 @@ class LinkedInScraper:
         """Check if a post is an original post (not a like, comment, etc.)."""
         try:
             # Check for activity indicators
-            activity_texts = [
-                "liked", "commented on", "replied", "reposted", 
-                "shared", "celebrates", "mentioned in", "follows"
-            ]
+            activity_texts = ACTIVITY_TEXTS
             
             post_text = post.text.lower()
             
@@ -722,13 +1339,7 @@ class LinkedInScraper:
                     return False
             
             # Check for content indicators
-            content_selectors = [
-                ".feed-shared-update-v2__description",
-                ".feed-shared-text",
-                ".update-components-text",
-                ".feed-shared-text-view",
-                ".update-components-update-v2__commentary"
-            ]
+            content_selectors = CONTENT_SELECTORS
             
             for selector in content_selectors:
                 content_elements = post.find_elements(By.CSS_SELECTOR, selector)
@@ -749,12 +1360,7 @@ class LinkedInScraper:
             self.expand_see_more_in_post(post)
             
             # Try different selectors for post content
-            content_selectors = [
-                ".feed-shared-update-v2__description",
-                ".feed-shared-text",
-                ".update-components-text",
-                ".feed-shared-text-view"
-            ]
+            content_selectors = TEXT_SELECTORS
             
             post_text = ""
             for selector in content_selectors:
@@ -795,56 +1401,15 @@ class LinkedInScraper:
     def expand_see_more_in_post(self, post):
         """Expand 'see more' links in a specific post."""
         try:
-            # Find all "see more" links in this post
-            see_more_selectors = [
-                ".inline-show-more-text__button",
-                ".feed-shared-inline-show-more-text__see-more",
-                ".feed-shared-text-view__see-more",
-                ".see-more",
-                "span.lt-line-clamp__more"
-            ]
+            result = self.driver.execute_script(
+                EXPAND_SEE_MORE_SCRIPT,
+                POST_CONTAINER_SELECTORS,
+                SEE_MORE_SELECTORS,
+                post
+            )
             
-            for selector in see_more_selectors:
-                try:
-                    see_more_buttons = post.find_elements(By.CSS_SELECTOR, selector)
-                    for button in see_more_buttons:
-                        try:
-                            if button.is_displayed():
-                                # Try JavaScript click
-                                self.driver.execute_script("arguments[0].click();", button)
-                                time.sleep(1)
-                        except:
-                            pass
-                except:
-                    continue
-            
-            # Also try with JavaScript
-            self.driver.execute_script("""
-                const post = arguments[0];
-                
-                // Find all elements containing "...more" or "see more" text
-                const allElements = post.querySelectorAll('*');
-                for (const el of allElements) {
-                    const text = el.textContent;
-                    if ((text.includes('…more') || 
-                         text.includes('...more') || 
-                         text.toLowerCase().includes('see more')) && 
-                        el.offsetWidth > 0 && 
-                        el.offsetHeight > 0) {
-                        
-                        try {
-                            el.click();
-                        } catch (e) {
-                            // Try parent element
-                            try {
-                                el.parentElement.click();
-                            } catch (e2) {
-                                // Ignore
-                            }
-                        }
-                    }
-                }
-            """, post)
+            if result['expanded']:
+                self.waiter.wait_for_settled("expand_see_more_in_post", quiet_ms=200, timeout=2)
             
             return True
             
@@ -858,10 +1423,12 @@ class LinkedInScraper:
             # Try to find the profile name
             profile_name = self.driver.execute_script("""
                 // Try to find profile name
-                const nameElement = document.querySelector('h1.text-heading-xlarge') || 
-                                   document.querySelector('.pv-text-details__left-panel h1');
-                return nameElement ? nameElement.textContent.trim() : null;
-            """)
+                for (const selector of arguments[0]) {
+                    const nameElement = document.querySelector(selector);
+                    if (nameElement) return nameElement.textContent.trim();
+                }
+                return null;
+            """, PROFILE_NAME_SELECTORS)
             
             if not profile_name:
                 # Try to extract from URL
@@ -877,9 +1444,42 @@ class LinkedInScraper:
             logger.error(f"Error extracting profile name: {str(e)}")
             return "Unknown Profile"
     
+    def start_save_pipeline(self, category, profile_url):
+        """Start a background saver that stores each extracted batch while scrolling continues."""
+        self._save_pipeline = SavePipeline(
+            lambda batch: self.save_posts_to_chromadb(batch, category, profile_url, show_progress_bar=False),
+            name=f"save-pipeline-{self.session_id}"
+        ).start()
+        return self._save_pipeline
+    
+    def finish_save_pipeline(self, pipeline, category, profile_url, scroll_time):
+        """Wait for queued batches, retry failed ones once, and return True if everything was stored."""
+        self._save_pipeline = None
+        pipeline.close()
+        
+        saved = pipeline.batches_submitted > 0
+        if pipeline.failed_posts:
+            logger.warning(f"Retrying {len(pipeline.failed_posts)} posts whose background save failed")
+            saved = self.save_posts_to_chromadb(pipeline.failed_posts, category, profile_url)
+        
+        self.pipeline_stats = pipeline.get_stats()
+        self.pipeline_stats['scroll_s'] = scroll_time
+        self.pipeline_stats['wall_s'] = scroll_time + pipeline.drain_wait_time
+        logger.info(
+            f"Save pipeline: scrolled {scroll_time:.1f}s, saved {pipeline.batches_saved} batches in "
+            f"{pipeline.save_time:.1f}s in the background, waited {pipeline.drain_wait_time:.1f}s to drain "
+            f"(max queue depth {pipeline.max_queue_depth})"
+        )
+        return saved
+    
     def scrape_profile(self, profile_url, category, profile_name_override=None):
         """Scrape a LinkedIn profile for original posts. Save posts to ChromaDB."""
+        pipeline = None
+        self.last_scrape = {"profile_url": profile_url, "stop_reason": None, "posts_seen": 0, "new_posts": 0}
         try:
+            # Drop network events from earlier pages so the byte count is this profile's
+            self.read_network_bytes()
+            
             # Navigate to the profile
             if not self.navigate_to_profile(profile_url):
                 logger.error(f"Failed to navigate to profile: {profile_url}")
@@ -887,12 +1487,30 @@ class LinkedInScraper:
             original_url = profile_url
             
             # Use the incremental scrolling method that handles redirects
-            posts = self.scroll_and_extract_incrementally(category, original_url, profile_name_override=profile_name_override)
+            pipeline = self.start_save_pipeline(category, profile_url) if self.streaming_save else None
+            previous_mark = self.high_water_marks.get(profile_url)
+            scroll_start = time.perf_counter()
+            try:
+                posts, stop_reason = self.scroll_and_extract_incrementally(category, original_url, profile_name_override=profile_name_override)
+            finally:
+                saved = self.finish_save_pipeline(pipeline, category, profile_url, time.perf_counter() - scroll_start) if pipeline else None
+            self.record_page_traffic(profile_url)
+            self.last_scrape.update(stop_reason=stop_reason, posts_seen=len(self.feed_fingerprints), new_posts=len(posts))
             
             # Save posts to ChromaDB immediately, even if we were redirected
             if posts:
-                self.save_posts_to_chromadb(posts, category, profile_url)
-                logger.info(f"Successfully saved {len(posts)} posts to ChromaDB")
+                if saved is None:
+                    saved = self.save_posts_to_chromadb(posts, category, profile_url)
+                if saved:
+                    logger.info(f"Successfully saved {len(posts)} posts to ChromaDB")
+                    # Only move the high-water mark once the posts are safely stored,
+                    # and only if nothing between it and the old mark was skipped
+                    if mark_reached(stop_reason, previous_mark):
+                        self.high_water_marks.update(profile_url, self.feed_fingerprints)
+                    else:
+                        logger.info(f"Stopped on {stop_reason} before the previous high-water mark; keeping it")
+            elif self.feed_fingerprints:
+                logger.info("No new posts since the last scrape")
             else:
                 logger.warning("No posts were extracted from the profile")
             
@@ -903,65 +1521,15 @@ class LinkedInScraper:
             if self.debug:
                 self.driver.save_screenshot(f'debug/{self.session_id}_scrape_profile_error.png')
             
-            # Even on error, try to save any accumulated posts
+            # Even on error, try to save any accumulated posts (the pipeline has already flushed its batches)
             if hasattr(self, 'accumulated_posts') and self.accumulated_posts:
-                logger.info(f"Saving {len(self.accumulated_posts)} posts to ChromaDB despite error")
-                self.save_posts_to_chromadb(self.accumulated_posts, category, profile_url)
+                if pipeline is None:
+                    logger.info(f"Saving {len(self.accumulated_posts)} posts to ChromaDB despite error")
+                    self.save_posts_to_chromadb(self.accumulated_posts, category, profile_url)
                 return self.accumulated_posts
             
             return []
     
-    def save_posts_to_chromadb(self, posts, category, profile_url):
-        """Save posts to ChromaDB with embeddings."""
-        try:
-            if not posts:
-                logger.warning("No posts to save")
-                return False
-            
-            logger.info(f"Generating embeddings for {len(posts)} posts...")
-            
-            # Extract texts for embedding
-            post_texts = [post['post_text'] for post in posts]
-            
-            # Generate embeddings
-            embeddings = self.embedding_model.encode(post_texts, show_progress_bar=True)
-            
-            # Get current count for unique IDs
-            try:
-                current_count = self.collection.count()
-            except:
-                current_count = 0
-            
-            # Prepare data for ChromaDB
-            documents = []
-            metadatas = []
-            ids = []
-            
-            for i, post in enumerate(posts):
-                documents.append(post['post_text'])
-                metadatas.append({
-                    'profile_name': post['profile_name'],
-                    'category': category,
-                    'profile_url': profile_url,
-                    'scraped_at': datetime.now().isoformat(),
-                    'session_id': self.session_id
-                })
-                ids.append(f"post_{current_count + i}_{self.session_id}")
-            
-            # Add to ChromaDB
-            self.collection.add(
-                documents=documents,
-                embeddings=embeddings.tolist(),
-                ids=ids,
-                metadatas=metadatas
-            )
-            
-            logger.info(f"Successfully saved {len(posts)} posts to ChromaDB")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error saving posts to ChromaDB: {str(e)}")
-            return False
     def query_posts(self, query_text, n_results=5, category_filter=None):
         """Query ChromaDB for similar posts."""
         try:
@@ -997,7 +1565,16 @@ class LinkedInScraper:
         
         Returns:
             list: List of scraped posts
+        
+        Raises:
+            BrowserUnavailableError: the browser is gone and could not be relaunched
         """
+        if not self.healthy:
+            raise BrowserUnavailableError("Scraper browser is unavailable after a failed relaunch")
+        
+        # Start long sessions over in a fresh browser before it slows down
+        self.maybe_recycle_browser()
+        
         try:
             logger.info(f"Starting scrape for profile: {profile_url}, category: {category}")
             if profile_name_override:
@@ -1010,9 +1587,48 @@ class LinkedInScraper:
         except Exception as e:
             logger.error(f"Error in scrape_user_profile: {str(e)}")
             return []
+        
+        finally:
+            # Failed profiles count too; they are often the heaviest pages
+            self.record_browser_usage()
+    
+    def get_wait_stats(self):
+        """Return time spent waiting on the page, per scraping phase."""
+        return self.waiter.get_stats() if hasattr(self, 'waiter') else {}
+    
+    def get_scroll_stats(self):
+        """Return scrolls, posts per scroll, posts/s and why scrolling stopped for the last profile."""
+        return self.scroll_controller.get_stats() if self.scroll_controller else {}
+    
+    def get_pipeline_stats(self):
+        """Return queue depth and stage timings of the last profile's save pipeline."""
+        return dict(self.pipeline_stats)
+    
+    def get_startup_stats(self):
+        """Return the cold-start time of each initialization phase and their total."""
+        stats = dict(self.startup_timings)
+        if self._embedding_model is not None and self._embedding_model.load_time is not None:
+            stats['model_load'] = self._embedding_model.load_time
+        stats['total'] = sum(elapsed for phase, elapsed in stats.items() if phase != 'total')
+        return stats
+    
+    def get_lifecycle_stats(self):
+        """Return browser restarts, profiles per browser and Chrome memory use."""
+        stats = dict(self.lifecycle_stats)
+        stats['max_profiles_per_browser'] = self.recycle_policy.max_profiles
+        stats['max_browser_rss_mb'] = self.recycle_policy.max_rss_mb
+        return stats
+    
+    def get_traffic_stats(self):
+        """Return total requests and bytes downloaded across scraped profile pages."""
+        stats = dict(self.traffic_stats)
+        stats['bytes_per_page'] = stats['bytes'] / stats['pages'] if stats['pages'] else 0
+        return stats
     
     def close(self):
         """Close the browser and clean up."""
+        if hasattr(self, 'scrape_log'):
+            self.scrape_log.close()
         try:
             if hasattr(self, 'driver'):
                 self.driver.quit()
@@ -0,0 +1,132 @@
+import time
+import logging
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+logger = logging.getLogger(__name__)
+
+# Installs (once per document) a MutationObserver that records when the DOM last
+# changed, then reports that alongside the number of post containers on the page.
+# idleMs counts from the later of the last mutation and the last scroll (marked
+# in window.__lcgScrollAt by the scroll script), so a page that was quiet before
+# the scroll is not mistaken for one where the scroll loaded nothing.
+# Attribute changes are not observed: the scraper's own data-lcg-* tags and the
+# page's class/hover churn would otherwise count as content still loading
+DOM_STATE_SCRIPT = """
+    if (!window.__lcgObserver && document.body) {
+        window.__lcgMutations = 0;
+        window.__lcgLastMutation = performance.now();
+        window.__lcgObserver = new MutationObserver(function(records) {
+            window.__lcgMutations += records.length;
+            window.__lcgLastMutation = performance.now();
+        });
+        window.__lcgObserver.observe(document.body, {childList: true, subtree: true, characterData: true});
+    }
+    const selector = arguments[0];
+    const now = performance.now();
+    const lastMutation = window.__lcgObserver ? window.__lcgLastMutation : now;
+    return {
+        readyState: document.readyState,
+        mutations: window.__lcgMutations || 0,
+        quietMs: now - lastMutation,
+        idleMs: now - Math.max(lastMutation, window.__lcgScrollAt || 0),
+        count: selector ? document.querySelectorAll(selector).length : 0
+    };
+"""
+
+# Condition shared by both scraper backends after a scroll: the feed grew and
+# the new nodes settled (grew: true), or nothing has changed for idleMs since
+# the scroll (grew: false). Anything else keeps the wait going. Arguments are
+# selector, previous container count, quiet ms and idle ms.
+FEED_GROWTH_SCRIPT = """
+    const [selector, previousCount, quietMs, idleMs] = arguments;
+    const state = (function() { """ + DOM_STATE_SCRIPT + """ }).apply(null, [selector]);
+    if (state.count > previousCount && state.quietMs >= quietMs) {
+        state.grew = true;
+        return state;
+    }
+    if (state.idleMs >= idleMs) {
+        state.grew = state.count > previousCount;
+        return state;
+    }
+    return false;
+"""
+
+
+class PageWaiter:
+    """Event-driven waits for the scraper, with the observed wait recorded per phase.
+
+    Every wait returns as soon as its condition holds and gives up (without
+    raising) after its timeout, so fast pages proceed immediately and slow
+    ones still get time to load.
+    """
+
+    def __init__(self, driver, timeout=20, poll_frequency=0.1):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.phase_stats = {}
+
+    def _record(self, phase, elapsed, timed_out):
+        stats = self.phase_stats.setdefault(phase, {
+            "waits": 0,
+            "total_s": 0.0,
+            "max_s": 0.0,
+            "timeouts": 0
+        })
+        stats["waits"] += 1
+        stats["total_s"] += elapsed
+        stats["max_s"] = max(stats["max_s"], elapsed)
+        if timed_out:
+            stats["timeouts"] += 1
+
+    def wait_until(self, condition, phase, timeout=None):
+        """Wait for condition(driver) to return something truthy; return it, or None on timeout."""
+        start = time.perf_counter()
+        timed_out = False
+        result = None
+        try:
+            result = WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            timed_out = True
+            logger.info(f"Wait for '{phase}' timed out after {timeout or self.timeout}s")
+        finally:
+            self._record(phase, time.perf_counter() - start, timed_out)
+        return result
+
+    def dom_state(self, selector=None):
+        return self.driver.execute_script(DOM_STATE_SCRIPT, selector)
+
+    def wait_for_page_ready(self, phase, timeout=None):
+        """Wait for document.readyState to reach 'complete'."""
+        return self.wait_until(
+            lambda driver: driver.execute_script("return document.readyState") == "complete",
+            phase,
+            timeout
+        )
+
+    def wait_for_settled(self, phase, quiet_ms=400, timeout=5):
+        """Wait until the DOM has had no mutations for quiet_ms."""
+        def settled(driver):
+            state = self.dom_state()
+            return state if state["readyState"] == "complete" and state["quietMs"] >= quiet_ms else False
+
+        return self.wait_until(settled, phase, timeout)
+
+    def wait_for_feed_growth(self, selector, previous_count, phase, quiet_ms=300, idle_ms=1500, timeout=8):
+        """Wait for more post containers to appear and settle after a scroll.
+
+        Returns the DOM state once the feed grew and the new nodes settled, or
+        once nothing has changed for idle_ms since the scroll (nothing more to
+        load). Returns None on timeout, which says nothing either way.
+        """
+        return self.wait_until(
+            lambda driver: driver.execute_script(FEED_GROWTH_SCRIPT, selector, previous_count, quiet_ms, idle_ms),
+            phase,
+            timeout
+        )
+
+    def get_stats(self):
+        """Return per-phase wait counts, totals, maxima and timeouts."""
+        return {phase: dict(stats) for phase, stats in self.phase_stats.items()}
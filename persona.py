@@ -5,8 +5,9 @@ import pandas as pd
 from datetime import datetime, timedelta
 import time
 import os
-from sentence_transformers import SentenceTransformer
 import chromadb
+from chroma_registry import get_chroma_registry
+from embedding_service import ServiceEmbeddingFunction
 from groq import Groq
 import uuid
 import numpy as np
@@ -16,43 +17,60 @@ class PersonaEvolutionSystem:
     def __init__(self, chroma_path="chroma_db", groq_api_key=None):
         self.chroma_path = chroma_path
         self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
-        self.client = chromadb.PersistentClient(path=chroma_path)
+        self.chroma_registry = get_chroma_registry(chroma_path)
+        self.client = self.chroma_registry.get_client()
         self.groq_client = Groq(api_key=self.groq_api_key) if self.groq_api_key else None
         
+        # Embed query_texts with the shared process-wide model (same all-MiniLM-L6-v2
+        # the scraper uses) instead of Chroma's own default embedder
+        self.embedding_function = ServiceEmbeddingFunction()
+        
         # Your existing collection for reference posts
         try:
-            self.posts_collection = self.client.get_collection(name="posts_collection")
+            self.posts_collection = self.chroma_registry.get_collection("posts_collection", embedding_function=self.embedding_function)
         except:
             self.posts_collection = None
         
         # New collections for persona evolution
-        self.user_stm_collection = self.client.get_or_create_collection(
+        self.user_stm_collection = self.chroma_registry.get_collection(
             name="user_short_term_memory",
+            create=True,
+            embedding_function=self.embedding_function,
             metadata={"description": "User's recent posts and analysis"}
         )
         
-        self.user_ltm_collection = self.client.get_or_create_collection(
-            name="user_long_term_memory", 
+        self.user_ltm_collection = self.chroma_registry.get_collection(
+            name="user_long_term_memory",
+            create=True,
+            embedding_function=self.embedding_function,
             metadata={"description": "User's compressed personality patterns"}
         )
         
-        self.persona_snapshots = self.client.get_or_create_collection(
+        self.persona_snapshots = self.chroma_registry.get_collection(
             name="user_persona_snapshots",
+            create=True,
+            embedding_function=self.embedding_function,
             metadata={"description": "Current user persona states"}
         )
         # Memory Feeder Collections
-        self.user_context_collection = self.client.get_or_create_collection(
+        self.user_context_collection = self.chroma_registry.get_collection(
             name="user_context_memory",
+            create=True,
+            embedding_function=self.embedding_function,
             metadata={"description": "User and company specific context information"}
         )
 
-        self.company_info_collection = self.client.get_or_create_collection(
-            name="company_info_memory", 
+        self.company_info_collection = self.chroma_registry.get_collection(
+            name="company_info_memory",
+            create=True,
+            embedding_function=self.embedding_function,
             metadata={"description": "Company details, culture, achievements, news"}
         )
 
-        self.user_achievements_collection = self.client.get_or_create_collection(
+        self.user_achievements_collection = self.chroma_registry.get_collection(
             name="user_achievements_memory",
+            create=True,
+            embedding_function=self.embedding_function,
             metadata={"description": "User personal achievements, experiences, projects"}
         )
 
@@ -0,0 +1,592 @@
+import os
+import re
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from uuid import uuid4
+
+import pandas as pd
+from dotenv import load_dotenv
+
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+from linkedin_scraper import (
+    EXTRACT_POSTS_SCRIPT, SCROLL_TO_LAST_POST_SCRIPT, EXPORT_LOCAL_STORAGE_SCRIPT,
+    IMPORT_LOCAL_STORAGE_SCRIPT, HIGH_WATER_STOP_MATCHES
+)
+from page_waits import FEED_GROWTH_SCRIPT
+from post_ids import make_post_id
+from scrape_state import get_high_water_marks, mark_reached
+from post_storage import PostStorageMixin
+from scroll_controller import ScrollController
+from session_store import SessionStore, SESSION_FILENAME
+from feed_selectors import (
+    PROFILE_NAME_SELECTORS, POST_CONTAINER_SELECTORS, ACTIVITY_TEXTS, CONTENT_SELECTORS, TEXT_SELECTORS,
+    SEE_MORE_SELECTORS, TIMESTAMP_SELECTORS, REACTIONS_SELECTORS, COMMENTS_SELECTORS
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Resource types never needed for text extraction; aborted in lean mode
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# URL fragments that mean LinkedIn sent us away from the feed being scraped
+REDIRECT_INDICATORS = ["/checkpoint/", "/authwall", "/uas/login", "/login", "/search/", "linkedin.com/404", "linkedin.com/error"]
+
+
+def sync_script(body):
+    """Wrap a Selenium execute_script body (reading `arguments`) for page.evaluate(script, [args])."""
+    return f"args => (function() {{ {body} }}).apply(null, args)"
+
+
+def async_script(body):
+    """Wrap a Selenium execute_async_script body (calling its last argument when done) for page.evaluate."""
+    return f"args => new Promise(done => (function() {{ {body} }}).apply(null, args.concat([done])))"
+
+
+PROFILE_NAME_SCRIPT = """selectors => {
+    for (const selector of selectors) {
+        const nameElement = document.querySelector(selector);
+        if (nameElement) return nameElement.textContent.trim();
+    }
+    return null;
+}"""
+
+
+def to_playwright_cookies(cookies):
+    """Convert Selenium-format cookies (as kept by SessionStore) for BrowserContext.add_cookies."""
+    converted = []
+    for cookie in cookies:
+        if not cookie.get("name") or not cookie.get("domain"):
+            continue
+        item = {
+            "name": cookie["name"],
+            "value": cookie.get("value", ""),
+            "domain": cookie["domain"],
+            "path": cookie.get("path", "/"),
+            "httpOnly": bool(cookie.get("httpOnly", False)),
+            "secure": bool(cookie.get("secure", False))
+        }
+        if cookie.get("expiry"):
+            item["expires"] = cookie["expiry"]
+        if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+            item["sameSite"] = cookie["sameSite"]
+        converted.append(item)
+    return converted
+
+
+def from_playwright_cookies(cookies):
+    """Convert BrowserContext.cookies() to the Selenium format, so both backends share one session file."""
+    converted = []
+    for cookie in cookies:
+        item = {key: cookie[key] for key in ("name", "value", "domain", "path", "httpOnly", "secure", "sameSite") if key in cookie}
+        if cookie.get("expires", -1) > 0:
+            item["expiry"] = int(cookie["expires"])
+        converted.append(item)
+    return converted
+
+
+def _profile_slug(url):
+    for marker in ("/in/", "/company/"):
+        if marker in url:
+            return url.split(marker)[1].split("/")[0]
+    return None
+
+
+def is_redirected(original_url, current_url):
+    """True if current_url is no longer the feed of the profile being scraped."""
+    original_profile = _profile_slug(original_url)
+    current_profile = _profile_slug(current_url)
+    if original_profile and current_profile:
+        return original_profile != current_profile
+    if "/feed/" in current_url and "/feed/update/" not in current_url:
+        return True
+    return any(indicator in current_url.lower() for indicator in REDIRECT_INDICATORS)
+
+
+class AsyncLinkedInScraper(PostStorageMixin):
+    """Playwright backend that scrapes several profiles at once as tabs of one browser.
+
+    Every tab is opened in the same browser context, so a single login (or
+    restored session) covers all of them, and up to max_concurrency feeds are
+    scrolled concurrently without starting more Chrome processes.
+    scrape_user_profile keeps LinkedInScraper's contract, as a coroutine.
+    """
+
+    def __init__(self, headless=True, debug=False, max_posts=50, chroma_db_path="chroma_db", max_concurrency=4,
+                 embedding_service=None, incremental=True, lean=True, session_path=None, resume_session=True,
+                 collection=None, replay_logs=True, base_url=None, timeout=20):
+        """Set up storage and settings; the browser is launched by start() (or `async with`)."""
+        if not PLAYWRIGHT_AVAILABLE:
+            raise ImportError("playwright is not installed (pip install playwright && playwright install chromium)")
+
+        self.headless = headless
+        self.debug = debug
+        self.max_posts = max_posts
+        self.max_concurrency = max_concurrency
+        self.incremental = incremental
+        self.lean = lean
+        self.resume_session = resume_session
+        self.timeout = timeout
+        self.base_url = (base_url or os.getenv('LINKEDIN_BASE_URL') or 'https://www.linkedin.com').rstrip('/')
+        self.logged_in = False
+        self.login_failed = False  # set once a login attempt fails, so queued tabs don't retry it
+        self.session_id = str(uuid4())[:8]
+
+        self.email = os.getenv('LINKEDIN_EMAIL')
+        self.password = os.getenv('LINKEDIN_PASSWORD')
+        if not self.email or not self.password:
+            raise ValueError("LinkedIn credentials not found in environment variables")
+
+        self.session_store = SessionStore(session_path or os.path.join(chroma_db_path, SESSION_FILENAME), self.email, self.password)
+        self.startup_timings = {}
+
+        if self.debug:
+            os.makedirs('debug', exist_ok=True)
+
+        # Posts are stored exactly as LinkedInScraper stores them
+        self.init_storage(chroma_db_path, collection, embedding_service, replay_logs)
+
+        self.high_water_marks = get_high_water_marks(chroma_db_path)
+
+        self._playwright = None
+        self.browser = None
+        self.context = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._login_lock = asyncio.Lock()
+        self._start_lock = asyncio.Lock()
+
+        # Per-profile results of the last run, keyed by profile URL
+        self.profile_stats = {}
+        self.run_time = 0.0
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Launch the browser and its shared context, and resume the saved session."""
+        async with self._start_lock:
+            if self.context is None:
+                await self._launch()
+        return self
+
+    async def _launch(self):
+        phase_start = time.perf_counter()
+        self._playwright = await async_playwright().start()
+        args = ['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
+        if self.lean:
+            args += ['--blink-settings=imagesEnabled=false', '--autoplay-policy=user-gesture-required']
+        self.browser = await self._playwright.chromium.launch(headless=self.headless, args=args)
+        self.context = await self.browser.new_context(user_agent=USER_AGENT, viewport={"width": 1920, "height": 1080})
+        self.context.set_default_timeout(self.timeout * 1000)
+        if self.lean:
+            await self.context.route("**/*", self._block_heavy_resources)
+        self.startup_timings['browser_launch'] = time.perf_counter() - phase_start
+
+        if self.resume_session:
+            phase_start = time.perf_counter()
+            await self.restore_session()
+            self.startup_timings['session_restore'] = time.perf_counter() - phase_start
+
+        logger.info("Async scraper cold start: " + ", ".join(f"{phase} {elapsed:.2f}s" for phase, elapsed in self.startup_timings.items()))
+
+    async def _block_heavy_resources(self, route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def validate_session(self, page):
+        """Load the feed in page and report whether the context is logged in."""
+        try:
+            await page.goto(f'{self.base_url}/feed/', wait_until="domcontentloaded")
+            await page.wait_for_selector('#global-nav', timeout=10000)
+            self.logged_in = True
+        except PlaywrightTimeoutError:
+            self.logged_in = False
+        return self.logged_in
+
+    async def restore_session(self):
+        """Load the encrypted saved session (shared with LinkedInScraper) into the context; return True if logged in."""
+        page = None
+        try:
+            state = self.session_store.load()
+            if not state:
+                return False
+
+            await self.context.add_cookies(to_playwright_cookies(state.get('cookies', [])))
+            page = await self.context.new_page()
+            if state.get('local_storage'):
+                await page.goto(f'{self.base_url}/', wait_until="domcontentloaded")
+                await page.evaluate(sync_script(IMPORT_LOCAL_STORAGE_SCRIPT), [state['local_storage']])
+
+            if await self.validate_session(page):
+                logger.info(f"Resumed LinkedIn session saved at {state.get('saved_at')}")
+                return True
+
+            logger.warning("Saved session is not valid")
+            self.session_store.clear()
+            return False
+
+        except Exception as e:
+            logger.error(f"Error restoring session: {str(e)}")
+            return False
+        finally:
+            if page is not None:
+                await page.close()
+
+    async def login(self, page):
+        """Fill in the login form; every tab of the context shares the resulting cookies."""
+        logger.info("Navigating to LinkedIn login page")
+        await page.goto(f'{self.base_url}/login', wait_until="domcontentloaded")
+        await page.fill('#username', self.email)
+        await page.fill('#password', self.password)
+        await page.click('button[type="submit"]')
+
+        try:
+            await page.wait_for_selector('#global-nav')
+            self.logged_in = True
+            logger.info("Successfully logged in")
+        except PlaywrightTimeoutError:
+            content = (await page.content()).lower()
+            if "security verification" in content or "challenge" in content:
+                logger.warning("Security verification detected; log in once with LinkedInScraper(headless=False) to save a session")
+            else:
+                logger.error("Login failed - couldn't detect navigation bar")
+            if self.debug:
+                await page.screenshot(path=f'debug/{self.session_id}_async_login_failure.png')
+        return self.logged_in
+
+    async def save_session(self, page):
+        """Write the context's cookies and localStorage to the encrypted session file."""
+        try:
+            cookies = from_playwright_cookies(await self.context.cookies())
+            local_storage = await page.evaluate(sync_script(EXPORT_LOCAL_STORAGE_SCRIPT), [])
+            return self.session_store.save(cookies, local_storage)
+        except Exception as e:
+            logger.error(f"Error saving session: {str(e)}")
+            return False
+
+    async def ensure_logged_in(self):
+        """Log in once for all tabs; concurrent callers wait for the first one.
+
+        A failed login is not retried by the tabs queued behind it (it would
+        only repeat the failure, or trip LinkedIn's checks).
+        """
+        async with self._login_lock:
+            if self.logged_in:
+                return True
+            if self.login_failed:
+                return False
+            page = await self.context.new_page()
+            try:
+                if await self.login(page):
+                    await self.save_session(page)
+            except Exception as e:
+                logger.error(f"Error logging in: {str(e)}")
+            finally:
+                await page.close()
+            self.login_failed = not self.logged_in
+            return self.logged_in
+
+    async def navigate_to_profile(self, page, profile_url):
+        """Open the profile's recent-activity feed in page and wait for the first posts."""
+        if "recent-activity/all" not in profile_url:
+            profile_url = profile_url.rstrip('/') + "/recent-activity/all/"
+
+        logger.info(f"Navigating to activity page: {profile_url}")
+        await page.goto(profile_url, wait_until="domcontentloaded")
+
+        if "recent-activity" not in page.url:
+            fallback_url = profile_url.replace("recent-activity/all/", "").rstrip('/') + "/posts/?feedView=all"
+            logger.info(f"Not on activity page ({page.url}), trying fallback URL: {fallback_url}")
+            await page.goto(fallback_url, wait_until="domcontentloaded")
+            if "posts" not in page.url and "recent-activity" not in page.url:
+                logger.warning(f"Both URLs failed. Current URL: {page.url}")
+                return False
+
+        try:
+            await page.wait_for_selector(", ".join(POST_CONTAINER_SELECTORS))
+            return True
+        except PlaywrightTimeoutError:
+            logger.warning(f"Timeout waiting for posts to load on {page.url}")
+            return False
+
+    async def extract_profile_name(self, page):
+        try:
+            profile_name = await page.evaluate(PROFILE_NAME_SCRIPT, PROFILE_NAME_SELECTORS)
+        except Exception as e:
+            logger.error(f"Error extracting profile name: {str(e)}")
+            profile_name = None
+        if not profile_name:
+            slug = _profile_slug(page.url)
+            profile_name = slug.replace('-', ' ').title() if slug else "Unknown Profile"
+        return profile_name
+
+    async def extract_current_posts(self, page, category, profile_name, processed_texts):
+        """Run the Selenium backend's extraction script in page; returns post dicts not seen before."""
+        try:
+            result = await page.evaluate(async_script(EXTRACT_POSTS_SCRIPT), [
+                POST_CONTAINER_SELECTORS, ACTIVITY_TEXTS, CONTENT_SELECTORS, TEXT_SELECTORS,
+                SEE_MORE_SELECTORS, TIMESTAMP_SELECTORS, REACTIONS_SELECTORS, COMMENTS_SELECTORS
+            ])
+        except Exception as e:
+            logger.error(f"Error extracting current posts: {str(e)}")
+            return []
+
+        post_data = []
+        for record in result['records']:
+            post_text = re.sub(r'\n\s*\n', '\n\n', record['text'] or '')
+            post_text = re.sub(r' +', ' ', post_text).strip()
+            if post_text in processed_texts or len(post_text) < 10:
+                continue
+
+            post = {
+                'profile_name': profile_name,
+                'post_text': post_text,
+                'category': category
+            }
+            for key in ('post_urn', 'timestamp_text', 'reactions', 'comments'):
+                if record.get(key) is not None:
+                    post[key] = record[key]
+            post_data.append(post)
+        return post_data
+
+    async def wait_for_feed_growth(self, page, previous_count, quiet_ms=300, idle_ms=1500, timeout=8):
+        """Wait for new post containers after a scroll (same condition as PageWaiter).
+
+        Returns True if the feed grew, False if it stayed idle for idle_ms after
+        the scroll, and None on timeout (inconclusive).
+        """
+        try:
+            handle = await page.wait_for_function(
+                sync_script(FEED_GROWTH_SCRIPT),
+                arg=[", ".join(POST_CONTAINER_SELECTORS), previous_count, quiet_ms, idle_ms],
+                polling=100,
+                timeout=timeout * 1000
+            )
+            state = await handle.json_value()
+            return bool(state.get("grew"))
+        except PlaywrightTimeoutError:
+            return None
+
+    async def scroll_and_extract(self, page, category, profile_url, profile_name):
+        """Scroll one tab's feed, extracting as it loads; returns (posts, feed fingerprints, controller)."""
+        known_fingerprints = self.high_water_marks.get(profile_url) if self.incremental else set()
+        posts = []
+        fingerprints = []
+        processed_texts = set()
+        known_seen = 0
+
+        async def extract():
+            nonlocal known_seen
+            new_posts = []
+            for post in await self.extract_current_posts(page, category, profile_name, processed_texts):
+                if post['post_text'] in processed_texts:
+                    continue
+                processed_texts.add(post['post_text'])
+                fingerprint = make_post_id(profile_url, post['post_text'])
+                fingerprints.append(fingerprint)
+                if fingerprint in known_fingerprints:
+                    known_seen += 1
+                    continue
+                new_posts.append(post)
+            posts.extend(new_posts)
+            self.scrape_log.append_posts(new_posts, profile_url)
+
+        controller = ScrollController(self.max_posts)
+        try:
+            while controller.should_continue(len(posts)):
+                if '/feed/update/' in page.url:
+                    # A "see more" click opened the post itself; go back to the feed
+                    await page.go_back(wait_until="domcontentloaded")
+                if is_redirected(profile_url, page.url):
+                    logger.warning(f"Redirect detected to {page.url}, keeping {len(posts)} posts")
+                    controller.stop("redirect", len(posts))
+                    break
+
+                await extract()
+                if len(posts) >= self.max_posts:
+                    controller.stop("target_reached", len(posts))
+                    break
+                if known_seen >= HIGH_WATER_STOP_MATCHES:
+                    logger.info(f"Reached already-stored posts on {profile_url}, stopping")
+                    controller.stop("high_water_mark", len(posts))
+                    break
+
+                loaded_before = await page.evaluate(sync_script(SCROLL_TO_LAST_POST_SCRIPT), [POST_CONTAINER_SELECTORS])
+                controller.record_scroll(await self.wait_for_feed_growth(page, loaded_before))
+
+            # Pick up whatever the last scroll loaded
+            if controller.stop_reason in ("feed_exhausted", "feed_stalled", "scroll_budget"):
+                await extract()
+                controller.posts = len(posts)
+        except Exception as e:
+            # Keep what was extracted so far; the caller still saves it
+            logger.error(f"Error scrolling {profile_url}: {str(e)}, keeping {len(posts)} posts")
+            controller.stop("error", len(posts))
+
+        return posts, fingerprints, controller
+
+    async def scrape_profile(self, profile_url, category, profile_name_override=None):
+        """Scrape one profile in its own tab and save its posts; waits for a free tab slot first."""
+        async with self._semaphore:
+            if not self.logged_in and not await self.ensure_logged_in():
+                logger.error(f"Not logged in, skipping {profile_url}")
+                return []
+
+            start = time.perf_counter()
+            previous_mark = self.high_water_marks.get(profile_url)
+            page = await self.context.new_page()
+            try:
+                if not await self.navigate_to_profile(page, profile_url):
+                    logger.error(f"Failed to navigate to profile: {profile_url}")
+                    return []
+
+                profile_name = profile_name_override or await self.extract_profile_name(page)
+                posts, fingerprints, controller = await self.scroll_and_extract(page, category, profile_url, profile_name)
+            except Exception as e:
+                logger.error(f"Error scraping profile {profile_url}: {str(e)}")
+                if self.debug:
+                    await page.screenshot(path=f'debug/{self.session_id}_async_scrape_error.png')
+                return []
+            finally:
+                await page.close()
+
+        # Embedding and the ChromaDB write are blocking, so they run off the event loop
+        if posts:
+            saved = await asyncio.to_thread(self.save_posts_to_chromadb, posts, category, profile_url, False)
+            if saved and mark_reached(controller.stop_reason, previous_mark):
+                self.high_water_marks.update(profile_url, fingerprints)
+            elif saved:
+                logger.info(f"Stopped on {controller.stop_reason} before the previous high-water mark of {profile_url}; keeping it")
+        elif fingerprints:
+            logger.info(f"No new posts on {profile_url} since the last scrape")
+        else:
+            logger.warning(f"No posts were extracted from {profile_url}")
+
+        scroll_stats = controller.get_stats()
+        self.profile_stats[profile_url] = {
+            "posts": len(posts),
+            "elapsed_s": time.perf_counter() - start,
+            "scroll": scroll_stats
+        }
+        logger.info(
+            f"Scraped {len(posts)} posts from {profile_url} in {scroll_stats['scrolls']} scrolls "
+            f"({scroll_stats['stop_reason']}, {scroll_stats['posts_per_sec']:.2f} posts/s)"
+        )
+        return posts
+
+    async def scrape_user_profile(self, profile_url, category, profile_name_override=None):
+        """Same contract as LinkedInScraper.scrape_user_profile: returns the scraped posts, [] on error."""
+        try:
+            await self.start()
+            logger.info(f"Starting scrape for profile: {profile_url}, category: {category}")
+            posts = await self.scrape_profile(profile_url, category, profile_name_override=profile_name_override)
+            logger.info(f"Completed scraping {profile_url}. Total posts saved to ChromaDB: {len(posts)}")
+            return posts
+        except Exception as e:
+            logger.error(f"Error in scrape_user_profile: {str(e)}")
+            return []
+
+    async def scrape_all(self, jobs):
+        """Scrape (profile_url, category[, profile_name_override]) tuples concurrently; return {profile_url: posts}.
+
+        A profile listed more than once is scraped once, with its first row's settings.
+        """
+        await self.start()
+        unique_jobs = {}
+        for job in jobs:
+            unique_jobs.setdefault(job[0], job)
+        jobs = list(unique_jobs.values())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self.scrape_user_profile(*job) for job in jobs))
+        self.run_time += time.perf_counter() - start
+        return {job[0]: posts for job, posts in zip(jobs, results)}
+
+    def get_startup_stats(self):
+        """Return the cold-start time of each initialization phase and their total."""
+        stats = dict(self.startup_timings)
+        stats['total'] = sum(self.startup_timings.values())
+        return stats
+
+    def get_stats(self):
+        profiles = len(self.profile_stats)
+        posts = sum(stats["posts"] for stats in self.profile_stats.values())
+        return {
+            "max_concurrency": self.max_concurrency,
+            "startup_phases": self.get_startup_stats(),
+            "profiles_scraped": profiles,
+            "posts_scraped": posts,
+            "run_time_s": self.run_time,
+            "profiles_per_hour": profiles / self.run_time * 3600 if self.run_time else 0.0,
+            "posts_per_minute": posts / self.run_time * 60 if self.run_time else 0.0,
+            "profiles": dict(self.profile_stats)
+        }
+
+    async def close(self):
+        """Close the browser and clean up."""
+        self.scrape_log.close()
+        try:
+            if self.browser is not None:
+                await self.browser.close()
+                logger.info("Browser closed successfully")
+            if self._playwright is not None:
+                await self._playwright.stop()
+        except Exception as e:
+            logger.error(f"Error closing browser: {str(e)}")
+        finally:
+            self.browser = None
+            self.context = None
+            self._playwright = None
+
+
+def scrape_profiles(jobs, max_concurrency=4, **kwargs):
+    """Run the async backend from synchronous code; returns ({profile_url: posts}, stats)."""
+    async def run():
+        async with AsyncLinkedInScraper(max_concurrency=max_concurrency, **kwargs) as scraper:
+            results = await scraper.scrape_all(jobs)
+            return results, scraper.get_stats()
+
+    return asyncio.run(run())
+
+
+def main():
+    """Command line entry point: python playwright_scraper.py --csv linkedin_profiles_summary.csv --tabs 4."""
+    parser = argparse.ArgumentParser(description="Scrape creators from the profiles CSV as concurrent tabs of one browser")
+    parser.add_argument("--csv", default="linkedin_profiles_summary.csv")
+    parser.add_argument("--tabs", type=int, default=4, help="Profiles scrolled concurrently")
+    parser.add_argument("--max-posts", type=int, default=50)
+    parser.add_argument("--show-browser", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        df = pd.read_csv(args.csv)
+        jobs = [(row['Post_URL'], row['Cat']) for _, row in df.iterrows()]
+        results, stats = scrape_profiles(jobs, max_concurrency=args.tabs, max_posts=args.max_posts, headless=not args.show_browser)
+    except Exception as e:
+        logger.error(f"Error running async scraper: {str(e)}")
+        sys.exit(1)
+
+    logger.info(
+        f"Scraped {stats['profiles_scraped']} profiles ({stats['posts_scraped']} new posts) in {stats['run_time_s']:.0f}s "
+        f"with {args.tabs} tabs: {stats['profiles_per_hour']:.0f} profiles/hour"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import re
+import hashlib
+
+
+def normalize_post_text(text):
+    """Collapse whitespace so cosmetic differences between scrapes don't change a post's identity."""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def normalize_profile_url(profile_url):
+    """Reduce a profile or activity URL to a stable profile key (e.g. 'in/andrewyng')."""
+    url = (profile_url or '').strip().lower()
+    url = url.split('?')[0].split('#')[0]
+    url = re.sub(r'^https?://', '', url)
+    url = re.sub(r'^([a-z]{2,3}\.)?linkedin\.com/', '', url)
+    url = re.sub(r'/(recent-activity|posts)(/.*)?$', '', url)
+    return url.rstrip('/')
+
+
+def make_post_id(profile_url, post_text):
+    """Deterministic ChromaDB id for a post, derived from (profile_url, normalized text)."""
+    key = f"{normalize_profile_url(profile_url)}\n{normalize_post_text(post_text)}"
+    return "post_" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
@@ -0,0 +1,205 @@
+import time
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Below this fraction of the corpus the filtered HNSW query is unreliable
+# (it can come back short or fail), so we score each creator's posts exactly
+MIN_FILTER_SELECTIVITY = 0.02
+
+# Never brute-force score more than this many candidates
+MAX_EXACT_CANDIDATES = 5000
+
+
+def build_creator_where(creators, category=None):
+    """Build a ChromaDB where clause restricting results to creators (and optionally a category)."""
+    creators = list(dict.fromkeys(creators))
+    if len(creators) == 1:
+        creator_clause = {"profile_name": {"$eq": creators[0]}}
+    else:
+        creator_clause = {"profile_name": {"$in": creators}}
+
+    if not category:
+        return creator_clause
+
+    if isinstance(category, (list, tuple, set)):
+        category_clause = {"category": {"$in": list(category)}}
+    else:
+        category_clause = {"category": {"$eq": category}}
+
+    return {"$and": [creator_clause, category_clause]}
+
+
+def _distance_fn(collection):
+    """Return a numpy distance function matching the collection's HNSW space."""
+    space = "l2"
+    try:
+        space = (collection.metadata or {}).get("hnsw:space", "l2")
+    except Exception:
+        pass
+
+    if space == "cosine":
+        def distance(query, matrix):
+            norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+            norms[norms == 0] = 1e-12
+            return 1.0 - (matrix @ query) / norms
+    elif space == "ip":
+        def distance(query, matrix):
+            return 1.0 - matrix @ query
+    else:
+        # Chroma's l2 space reports squared euclidean distance
+        def distance(query, matrix):
+            diff = matrix - query
+            return np.einsum("ij,ij->i", diff, diff)
+
+    return distance
+
+
+def _exact_creator_search(collection, query_embedding, creators, top_k, category=None):
+    """Score every post of each creator exactly; return (rows, candidates_scanned)."""
+    distance = _distance_fn(collection)
+    query = np.asarray(query_embedding, dtype=np.float32)
+
+    rows = []
+    scanned = 0
+    for creator in dict.fromkeys(creators):
+        if scanned >= MAX_EXACT_CANDIDATES:
+            logger.warning("Exact search candidate cap reached, skipping remaining creators")
+            break
+
+        results = collection.get(
+            where=build_creator_where([creator], category),
+            limit=MAX_EXACT_CANDIDATES - scanned,
+            include=["embeddings", "documents", "metadatas"]
+        )
+        if not results["ids"]:
+            continue
+
+        matrix = np.asarray(results["embeddings"], dtype=np.float32)
+        distances = distance(query, matrix)
+        scanned += len(results["ids"])
+
+        # Keep only this creator's best top_k before merging
+        best = np.argsort(distances)[:top_k]
+        for idx in best:
+            rows.append((results["documents"][idx], results["metadatas"][idx], float(distances[idx])))
+
+    rows.sort(key=lambda row: row[2])
+    return rows[:top_k], scanned
+
+
+def filtered_vector_search(collection, query_embedding, creators, top_k=5, category=None, expected_matches=None):
+    """Run a vector search restricted to creators inside the index query.
+
+    expected_matches, when known (e.g. from the creator inventory), skips the
+    metadata pass used to measure how selective the filter is.
+
+    Returns (rows, stats) where rows is a list of (document, metadata, distance)
+    sorted by distance and stats records the mode used and candidates scanned.
+    """
+    start = time.perf_counter()
+    stats = {"mode": "filtered", "matching_posts": 0, "candidates_scanned": 0, "search_time_s": 0.0}
+
+    if not creators:
+        return [], stats
+
+    where = build_creator_where(creators, category)
+
+    # Cheap metadata-only pass to learn how selective the filter is
+    if expected_matches is None:
+        matching_posts = len(collection.get(where=where, include=[])["ids"])
+    else:
+        matching_posts = expected_matches
+    total_posts = collection.count()
+    stats["matching_posts"] = matching_posts
+
+    if matching_posts == 0:
+        stats["search_time_s"] = time.perf_counter() - start
+        return [], stats
+
+    selectivity = matching_posts / total_posts if total_posts else 1.0
+    rows = None
+
+    if selectivity >= MIN_FILTER_SELECTIVITY or matching_posts > MAX_EXACT_CANDIDATES:
+        try:
+            results = collection.query(
+                query_embeddings=[list(map(float, query_embedding))],
+                n_results=min(top_k, matching_posts),
+                where=where,
+                include=["documents", "metadatas", "distances"]
+            )
+            rows = list(zip(results["documents"][0], results["metadatas"][0], results["distances"][0]))
+            stats["candidates_scanned"] = matching_posts
+        except Exception as e:
+            logger.warning(f"Filtered index query failed, falling back to exact search: {str(e)}")
+            rows = None
+
+    if rows is None:
+        stats["mode"] = "exact"
+        rows, stats["candidates_scanned"] = _exact_creator_search(collection, query_embedding, creators, top_k, category)
+
+    stats["search_time_s"] = time.perf_counter() - start
+    logger.info(
+        f"Retrieved {len(rows)} posts ({stats['mode']} mode, "
+        f"{stats['candidates_scanned']} candidates scanned, {stats['search_time_s']:.3f}s)"
+    )
+    return rows, stats
+
+
+def _post_row(post_id, doc, meta, preview_chars=None):
+    """Shape a stored post for display, optionally dropping the full text."""
+    words = doc.split()
+    row = {
+        "id": post_id,
+        "profile_name": meta["profile_name"],
+        "category": meta["category"],
+        "scraped_at": meta.get("scraped_at", "Unknown"),
+        "post_length": len(doc),
+        "hashtags": len([word for word in words if word.startswith('#')]),
+        "mentions": len([word for word in words if word.startswith('@')])
+    }
+
+    if preview_chars is None:
+        row["post_text"] = doc
+    else:
+        row["post_preview"] = doc[:preview_chars]
+        row["is_truncated"] = len(doc) > preview_chars
+
+    return row
+
+
+def iter_posts_by_creators(collection, creators, page_size=50, offset=0, limit=None, preview_chars=None, category=None):
+    """Yield posts for creators page by page using a server-side where filter.
+
+    Only one page of documents is held in memory at a time. With preview_chars
+    set, rows carry a truncated post_preview plus post_length instead of the
+    full post_text, which can be fetched later by the row's id.
+    """
+    if not creators:
+        return
+
+    where = build_creator_where(creators, category)
+    yielded = 0
+
+    while limit is None or yielded < limit:
+        fetch = page_size if limit is None else min(page_size, limit - yielded)
+        results = collection.get(
+            where=where,
+            limit=fetch,
+            offset=offset,
+            include=["documents", "metadatas"]
+        )
+
+        documents = results["documents"]
+        if not documents:
+            return
+
+        for post_id, doc, meta in zip(results["ids"], documents, results["metadatas"]):
+            yield _post_row(post_id, doc, meta, preview_chars)
+            yielded += 1
+
+        if len(documents) < fetch:
+            return
+        offset += len(documents)
@@ -0,0 +1,175 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+
+from chroma_registry import get_chroma_registry
+from creator_inventory import get_creator_inventory
+from post_ids import make_post_id
+from scrape_log import ScrapeLog, replay_unsaved_logs, LOG_DIRNAME
+from embedding_service import get_embedding_service
+from embedding_cache import get_embedding_cache
+
+logger = logging.getLogger(__name__)
+
+# Log directories whose abandoned logs this process has already replayed
+_replayed_log_dirs = set()
+_replayed_lock = threading.Lock()
+
+
+class PostStorageMixin:
+    """ChromaDB storage shared by the Selenium and Playwright scrapers.
+
+    Both backends store posts the same way (same IDs, metadata, embedding
+    cache and crash log). A scraper calls init_storage() from its __init__
+    after setting session_id and startup_timings.
+    """
+
+    def init_storage(self, chroma_db_path, collection=None, embedding_service=None, replay_logs=True):
+        # ChromaDB and the embedding model are opened on first use (see the
+        # collection and embedding_model properties), so a scrape that fails
+        # or finds nothing never pays for them. Both can also be injected.
+        self.chroma_db_path = chroma_db_path
+        self._collection = collection
+        self._embedding_model = embedding_service
+        self._embedding_cache = None
+        self._lazy_lock = threading.Lock()
+
+        # Every extracted post is logged before it is stored, so a crash or a
+        # failed ChromaDB write never loses a scrape
+        self.scrape_log = ScrapeLog(os.path.join(chroma_db_path, LOG_DIRNAME), self.session_id)
+        # Logs left by crashed sessions are replayed on the first save, not here,
+        # so constructing a scraper never loads the model or the collection
+        self._replay_pending = replay_logs
+
+    @property
+    def collection(self):
+        """posts_collection, opened through the shared registry on first use."""
+        if self._collection is None:
+            with self._lazy_lock:
+                if self._collection is None:
+                    phase_start = time.perf_counter()
+                    self._collection = get_chroma_registry(self.chroma_db_path).get_collection("posts_collection", create=True)
+                    self.startup_timings['chroma_open'] = time.perf_counter() - phase_start
+                    logger.info("Connected to ChromaDB collection")
+        return self._collection
+
+    @property
+    def embedding_model(self):
+        """The process-wide embedding service; its model only loads on the first encode."""
+        if self._embedding_model is None:
+            self._embedding_model = get_embedding_service()
+        return self._embedding_model
+
+    @property
+    def embedding_cache(self):
+        """On-disk cache so re-scraped, unchanged posts are never re-encoded."""
+        if self._embedding_cache is None:
+            self._embedding_cache = get_embedding_cache(os.path.join(self.chroma_db_path, "embedding_cache"), self.embedding_model.model_name)
+        return self._embedding_cache
+
+    def replay_pending_logs(self):
+        """Replay abandoned scrape logs on this scraper's first save, once per process and log directory."""
+        if not self._replay_pending:
+            return
+        self._replay_pending = False
+        log_dir = os.path.abspath(os.path.join(self.chroma_db_path, LOG_DIRNAME))
+        with _replayed_lock:
+            if log_dir in _replayed_log_dirs:
+                return
+            _replayed_log_dirs.add(log_dir)
+        self.replay_unsaved_logs()
+
+    def replay_unsaved_logs(self):
+        """Store posts left in the scrape logs of sessions that crashed or failed to save."""
+        try:
+            return replay_unsaved_logs(os.path.join(self.chroma_db_path, LOG_DIRNAME), self.save_posts_to_chromadb)
+        except Exception as e:
+            logger.error(f"Error replaying scrape logs: {str(e)}")
+            return {}
+
+    def save_posts_to_chromadb(self, posts, category, profile_url, show_progress_bar=True):
+        """Save posts to ChromaDB with embeddings."""
+        try:
+            if not posts:
+                logger.warning("No posts to save")
+                return False
+
+            self.replay_pending_logs()
+
+            # Deterministic IDs: the same post scraped twice maps to the same record
+            unique_posts = {}
+            for post in posts:
+                post_id = make_post_id(profile_url, post['post_text'])
+                if post_id not in unique_posts:
+                    unique_posts[post_id] = post
+
+            ids = list(unique_posts.keys())
+            posts = list(unique_posts.values())
+
+            logger.info(f"Generating embeddings for {len(posts)} posts...")
+
+            # Extract texts for embedding
+            post_texts = [post['post_text'] for post in posts]
+
+            # Generate embeddings (only texts missing from the on-disk cache hit the model)
+            embeddings = self.embedding_cache.encode(post_texts, self.embedding_model, show_progress_bar=show_progress_bar)
+
+            # Find which posts are already stored so the inventory only counts new ones
+            try:
+                existing_ids = set(self.collection.get(ids=ids, include=[])["ids"])
+            except:
+                existing_ids = set()
+
+            # Prepare data for ChromaDB
+            documents = []
+            metadatas = []
+
+            for post in posts:
+                documents.append(post['post_text'])
+                metadata = {
+                    'profile_name': post['profile_name'],
+                    'category': category,
+                    'profile_url': profile_url,
+                    'scraped_at': datetime.now().isoformat(),
+                    'session_id': self.session_id
+                }
+                # Optional fields from JS extraction (ChromaDB metadata can't hold None)
+                for key in ('post_urn', 'timestamp_text', 'reactions', 'comments'):
+                    if post.get(key) is not None:
+                        metadata[key] = post[key]
+                metadatas.append(metadata)
+
+            # An existing corpus gets its inventory built from the collection before
+            # the first incremental update, so creators stored earlier are counted
+            inventory = get_creator_inventory(self.chroma_db_path)
+            try:
+                inventory.ensure_built(self.collection)
+            except Exception as e:
+                logger.error(f"Error building creator inventory: {str(e)}")
+
+            # Upsert so re-scrapes refresh existing posts instead of duplicating them
+            self.collection.upsert(
+                documents=documents,
+                embeddings=embeddings.tolist(),
+                ids=ids,
+                metadatas=metadatas
+            )
+            self.scrape_log.mark_saved(ids)
+
+            # Keep the per-creator inventory in step with the collection
+            try:
+                new_metadatas = [meta for post_id, meta in zip(ids, metadatas) if post_id not in existing_ids]
+                updated_metadatas = [meta for post_id, meta in zip(ids, metadatas) if post_id in existing_ids]
+                inventory.record_posts(new_metadatas, updated_metadatas)
+            except Exception as e:
+                logger.error(f"Error updating creator inventory: {str(e)}")
+
+            logger.info(f"{len(posts) - len(existing_ids)} new posts, {len(existing_ids)} already stored")
+            logger.info(f"Successfully saved {len(posts)} posts to ChromaDB")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving posts to ChromaDB: {str(e)}")
+            return False
@@ -0,0 +1,276 @@
+import os
+import re
+import copy
+import glob
+import time
+import zlib
+import random
+import logging
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from bs4 import BeautifulSoup
+
+from feed_selectors import POST_CONTAINER_SELECTORS, TEXT_SELECTORS
+from snapshot_extraction import HTML_PARSER
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "feeds")
+SESSION_COOKIE = "li_at"
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>LinkedIn Login</title></head>
+<body>
+<form method="post" action="/login">
+  <input id="username" name="session_key" type="text">
+  <input id="password" name="session_password" type="password">
+  <button type="submit">Sign in</button>
+</form>
+</body></html>"""
+
+FEED_PAGE = """<!DOCTYPE html>
+<html><head><title>Feed | LinkedIn</title></head>
+<body><div id="global-nav"><nav>Home My Network Jobs</nav></div><main>Feed</main></body></html>"""
+
+CHECKPOINT_PAGE = """<!DOCTYPE html>
+<html><head><title>Security Verification | LinkedIn</title></head>
+<body><main>Let's do a quick security check</main></body></html>"""
+
+# Cards get a real height so scrolling behaves like the site; new pages are
+# fetched when the viewport nears the bottom, as LinkedIn's infinite scroll does
+ACTIVITY_PAGE = """<!DOCTYPE html>
+<html><head><title>{name} | Activity | LinkedIn</title>
+<style>
+  .feed-shared-update-v2 {{ min-height: 320px; margin: 16px auto; width: 560px; border: 1px solid #ddd; }}
+</style>
+</head>
+<body>
+<div id="global-nav"><nav>Home My Network Jobs</nav></div>
+<main class="scaffold-layout__main">
+  <div class="pv-text-details__left-panel"><h1 class="text-heading-xlarge">{name}</h1></div>
+  <div class="scaffold-finite-scroll__content"><ul id="feed">{posts}</ul></div>
+</main>
+<script>
+  (function() {{
+    let start = {next_start};
+    let loading = false;
+    let done = {done};
+    window.addEventListener('scroll', function() {{
+      if (loading || done) return;
+      if (window.innerHeight + window.scrollY < document.body.scrollHeight - 600) return;
+      loading = true;
+      fetch('/api/feed/{slug}?start=' + start).then(function(response) {{
+        const redirect = response.headers.get('X-Replay-Redirect');
+        if (redirect) {{ window.location.href = redirect; return ''; }}
+        return response.text();
+      }}).then(function(html) {{
+        if (!html.trim()) {{ done = true; return; }}
+        document.getElementById('feed').insertAdjacentHTML('beforeend', html);
+        start += {page_size};
+      }}).finally(function() {{ loading = false; }});
+    }});
+  }})();
+</script>
+</body></html>"""
+
+
+class ReplayConfig:
+    """Behaviour of the stand-in site: feed size, paging, latency and injected redirects."""
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, posts_per_profile=60, page_size=5,
+                 latency_ms=150, jitter_ms=50, redirect_after_pages=None, redirect_to="/checkpoint/challenge/"):
+        self.fixtures_dir = fixtures_dir
+        self.posts_per_profile = posts_per_profile
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.redirect_after_pages = redirect_after_pages
+        self.redirect_to = redirect_to
+
+
+def load_post_templates(fixtures_dir):
+    """Post containers from the recorded feed pages (snapshots or fixtures) to serve as templates."""
+    templates = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            soup = BeautifulSoup(f.read(), HTML_PARSER)
+        for selector in POST_CONTAINER_SELECTORS:
+            containers = soup.select(selector)
+            if containers:
+                templates.extend(containers)
+                break
+    if not templates:
+        raise ValueError(f"No post containers found in {fixtures_dir}")
+    return templates
+
+
+class ReplayServer:
+    """Local HTTP stand-in for LinkedIn login and recent-activity pages.
+
+    Serves recorded post markup with infinite-scroll paging, a configurable
+    per-request latency and optional redirects injected after a number of
+    feed pages, so the scraper can be benchmarked end to end offline.
+    """
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or ReplayConfig()
+        self.templates = load_post_templates(self.config.fixtures_dir)
+        self.stats = {"requests": 0, "logins": 0, "feed_pages": 0, "redirects": 0}
+        self._feed_pages = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def do_GET(self):
+                server.handle(self, "GET")
+
+            def do_POST(self):
+                server.handle(self, "POST")
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Replay server listening on {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def render_post(self, slug, index):
+        """Render post number index of a profile from a template, with unique text and URN."""
+        container = copy.copy(self.templates[index % len(self.templates)])
+        # Older recorded layouts get the current container class so one selector finds every post
+        if "feed-shared-update-v2" not in container.get("class", []):
+            container["class"] = container.get("class", []) + ["feed-shared-update-v2"]
+        container["data-urn"] = f"urn:li:activity:{zlib.crc32(slug.encode('utf-8'))}{index:06d}"
+        for holder in container.select("[data-urn]"):
+            holder["data-urn"] = container["data-urn"]
+        for selector in TEXT_SELECTORS:
+            element = container.select_one(selector)
+            if element is not None:
+                element.append(f" [{slug} #{index}]")
+                break
+        return f'<li class="profile-creator-shared-feed-update__container">{container}</li>'
+
+    def render_posts(self, slug, start):
+        end = min(start + self.config.page_size, self.config.posts_per_profile)
+        return "".join(self.render_post(slug, index) for index in range(start, end))
+
+    def handle(self, request, method):
+        with self._lock:
+            self.stats["requests"] += 1
+
+        if self.config.latency_ms:
+            time.sleep(max(0, self.config.latency_ms + random.uniform(-self.config.jitter_ms, self.config.jitter_ms)) / 1000)
+
+        parsed = urlparse(request.path)
+        path = parsed.path
+        logged_in = f"{SESSION_COOKIE}=replay" in (request.headers.get("Cookie") or "")
+
+        if path == "/login" and method == "POST":
+            with self._lock:
+                self.stats["logins"] += 1
+            return self.respond(request, 303, headers={"Location": "/feed/", "Set-Cookie": f"{SESSION_COOKIE}=replay; Path=/"})
+        if path == "/login":
+            return self.respond(request, 200, LOGIN_PAGE)
+        if path == "/":
+            return self.respond(request, 200, FEED_PAGE if logged_in else LOGIN_PAGE)
+        if path == "/authwall":
+            return self.respond(request, 200, LOGIN_PAGE)
+        if path.startswith("/checkpoint/"):
+            return self.respond(request, 200, CHECKPOINT_PAGE)
+        if not logged_in:
+            return self.respond(request, 302, headers={"Location": "/authwall"})
+        if path == "/feed/":
+            return self.respond(request, 200, FEED_PAGE)
+
+        match = re.match(r"^/in/([^/]+)/(recent-activity/all/?|posts/?)$", path)
+        if match:
+            return self.serve_activity_page(request, match.group(1))
+
+        match = re.match(r"^/api/feed/([^/]+)$", path)
+        if match:
+            start = int(parse_qs(parsed.query).get("start", ["0"])[0])
+            return self.serve_feed_page(request, match.group(1), start)
+
+        return self.respond(request, 404, "<html><body>Not found</body></html>")
+
+    def serve_activity_page(self, request, slug):
+        with self._lock:
+            self._feed_pages[slug] = 0
+        name = slug.replace("-", " ").title()
+        first_page = self.render_posts(slug, 0)
+        next_start = min(self.config.page_size, self.config.posts_per_profile)
+        html = ACTIVITY_PAGE.format(
+            name=name,
+            slug=slug,
+            posts=first_page,
+            next_start=next_start,
+            page_size=self.config.page_size,
+            done="true" if next_start >= self.config.posts_per_profile else "false"
+        )
+        return self.respond(request, 200, html)
+
+    def serve_feed_page(self, request, slug, start):
+        with self._lock:
+            pages = self._feed_pages.get(slug, 0) + 1
+            self._feed_pages[slug] = pages
+            self.stats["feed_pages"] += 1
+            redirect = self.config.redirect_after_pages is not None and pages > self.config.redirect_after_pages
+            if redirect:
+                self.stats["redirects"] += 1
+        if redirect:
+            return self.respond(request, 200, "", headers={"X-Replay-Redirect": self.config.redirect_to})
+        return self.respond(request, 200, self.render_posts(slug, start))
+
+    def respond(self, request, status, body="", headers=None):
+        payload = body.encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        request.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            request.send_header(key, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+
+def main():
+    """Run the stand-in site on its own: python replay_server.py --port 8765."""
+    parser = argparse.ArgumentParser(description="Serve recorded LinkedIn pages locally")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--posts", type=int, default=60, help="Posts per profile feed")
+    parser.add_argument("--page-size", type=int, default=5)
+    parser.add_argument("--latency-ms", type=int, default=150)
+    parser.add_argument("--redirect-after", type=int, default=None, help="Redirect to a checkpoint after this many feed pages")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    config = ReplayConfig(args.fixtures, args.posts, args.page_size, args.latency_ms, redirect_after_pages=args.redirect_after)
+    server = ReplayServer(config, port=args.port)
+    print(f"Serving on {server.url} (e.g. {server.url}/in/replay-creator/recent-activity/all/)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU cache with hit/miss/eviction counters.
+
+    Entries can be tied to a version (e.g. the corpus version); when a
+    lookup arrives with a newer version the whole cache is dropped.
+    """
+
+    def __init__(self, maxsize=256, name="cache"):
+        self.maxsize = maxsize
+        self.name = name
+        self.version = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self, version):
+        if version is not None and version != self.version:
+            if self._data:
+                logger.info(f"{self.name}: version {self.version} -> {version}, dropping {len(self._data)} entries")
+                self.invalidations += 1
+            self._data.clear()
+            self.version = version
+
+    def get(self, key, version=None):
+        """Return the cached value or None."""
+        with self._lock:
+            self._check_version(version)
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, version=None):
+        with self._lock:
+            self._check_version(version)
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+# Query-text embeddings only depend on the model, so they survive corpus changes
+query_embedding_cache = LRUCache(maxsize=512, name="query_embeddings")
+
+# (query, creator set, top_k, category) -> results; invalidated by the corpus version
+search_results_cache = LRUCache(maxsize=128, name="search_results")
+
+
+def make_search_key(query, creators, top_k, category=None):
+    """Build a hashable key for a similar-posts search."""
+    if isinstance(category, (list, tuple, set)):
+        category = tuple(sorted(category))
+    return (query.strip(), frozenset(creators), top_k, category)
@@ -0,0 +1,95 @@
+import time
+import queue
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class SavePipeline:
+    """Background consumer that embeds and stores post batches while the browser keeps scrolling.
+
+    The producer (the scroll loop) hands each batch of new posts to submit();
+    a worker thread passes them to save_fn. The queue is bounded, so a slow
+    store applies backpressure instead of buffering a whole feed in memory.
+    Batches whose save fails are kept in failed_posts for the caller to retry.
+    """
+
+    def __init__(self, save_fn, max_queue=4, name="save-pipeline"):
+        self.save_fn = save_fn
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.name = name
+        self.failed_posts = []
+        self._thread = None
+
+        # Stage timings and queue metrics
+        self.batches_submitted = 0
+        self.posts_submitted = 0
+        self.batches_saved = 0
+        self.batches_failed = 0
+        self.save_time = 0.0
+        self.enqueue_wait_time = 0.0
+        self.drain_wait_time = 0.0
+        self.max_queue_depth = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            batch = self.queue.get()
+            try:
+                if batch is _STOP:
+                    return
+                start = time.perf_counter()
+                try:
+                    saved = self.save_fn(batch)
+                except Exception as e:
+                    logger.error(f"Error saving batch in background: {str(e)}")
+                    saved = False
+                self.save_time += time.perf_counter() - start
+                if saved:
+                    self.batches_saved += 1
+                else:
+                    self.batches_failed += 1
+                    self.failed_posts.extend(batch)
+            finally:
+                self.queue.task_done()
+
+    def submit(self, posts):
+        """Queue a batch of posts for saving; blocks while the queue is full."""
+        if not posts:
+            return
+        start = time.perf_counter()
+        self.queue.put(list(posts))
+        self.enqueue_wait_time += time.perf_counter() - start
+        self.batches_submitted += 1
+        self.posts_submitted += len(posts)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def close(self):
+        """Wait until every queued batch is saved and stop the worker."""
+        if self._thread is None:
+            return
+        start = time.perf_counter()
+        self.queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self.drain_wait_time = time.perf_counter() - start
+
+    def get_stats(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "batches_submitted": self.batches_submitted,
+            "posts_submitted": self.posts_submitted,
+            "batches_saved": self.batches_saved,
+            "batches_failed": self.batches_failed,
+            "save_s": self.save_time,
+            "enqueue_wait_s": self.enqueue_wait_time,
+            "drain_wait_s": self.drain_wait_time
+        }
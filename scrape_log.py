@@ -0,0 +1,215 @@
+import os
+import json
+import glob
+import logging
+import threading
+from datetime import datetime
+
+from post_ids import make_post_id
+
+logger = logging.getLogger(__name__)
+
+LOG_DIRNAME = "scrape_logs"
+
+# Sessions with an open log in this process; their files are never replayed
+_active_sessions = set()
+_active_lock = threading.Lock()
+
+
+class ScrapeLog:
+    """Per-session write-ahead JSONL log of scraped posts.
+
+    Every post is appended (and fsynced) as soon as it is extracted, and
+    marked saved once it is in ChromaDB. When nothing is pending the file is
+    deleted, so any log left on disk holds posts a crashed or failed session
+    never stored; replay_unsaved_logs() loads those on the next start.
+    """
+
+    def __init__(self, log_dir, session_id):
+        self.log_dir = log_dir
+        self.session_id = session_id
+        self.path = os.path.join(log_dir, f"{session_id}.jsonl")
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = set()
+
+        with _active_lock:
+            _active_sessions.add(session_id)
+
+    def _write(self, records):
+        if self._file is None:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps({
+                "type": "session",
+                "session_id": self.session_id,
+                "pid": os.getpid(),
+                "started_at": datetime.now().isoformat()
+            }) + "\n")
+        for record in records:
+            self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _remove(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def append_posts(self, posts, profile_url):
+        """Log newly extracted posts before anything else happens to them."""
+        if not posts:
+            return
+        records = []
+        for post in posts:
+            post_id = make_post_id(profile_url, post['post_text'])
+            records.append({"type": "post", "id": post_id, "profile_url": profile_url, "post": post})
+        try:
+            with self._lock:
+                self._write(records)
+                self._pending.update(record["id"] for record in records)
+        except Exception as e:
+            logger.error(f"Error writing scrape log: {str(e)}")
+
+    def mark_saved(self, post_ids):
+        """Record that posts are stored; drops the file once nothing is pending."""
+        try:
+            with self._lock:
+                saved = [post_id for post_id in post_ids if post_id in self._pending]
+                if not saved:
+                    return
+                self._pending.difference_update(saved)
+                if self._pending:
+                    self._write([{"type": "saved", "ids": saved}])
+                else:
+                    self._remove()
+        except Exception as e:
+            logger.error(f"Error updating scrape log: {str(e)}")
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    def close(self):
+        """Close the log; unsaved posts stay on disk for replay."""
+        with self._lock:
+            if self._pending:
+                logger.warning(f"{len(self._pending)} scraped posts were not saved; kept in {self.path} for replay")
+            else:
+                self._remove()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        with _active_lock:
+            _active_sessions.discard(self.session_id)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def read_unsaved_posts(path):
+    """Return (header, {(profile_url, category): [posts]}) for the unsaved posts in a log."""
+    header = {}
+    posts = {}
+    saved = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash mid-write leaves a truncated last line
+                continue
+            if record.get("type") == "session":
+                header = record
+            elif record.get("type") == "post":
+                posts[record["id"]] = record
+            elif record.get("type") == "saved":
+                saved.update(record["ids"])
+
+    groups = {}
+    for post_id, record in posts.items():
+        if post_id in saved:
+            continue
+        key = (record["profile_url"], record["post"].get("category"))
+        groups.setdefault(key, []).append(record["post"])
+    return header, groups
+
+
+def replay_unsaved_logs(log_dir, save_fn):
+    """Store the posts from abandoned session logs with save_fn(posts, category, profile_url).
+
+    A log is abandoned when its session is not open in this process and its
+    process is gone (or, on Windows, when it is over an hour old). Each file
+    is claimed with a rename so concurrent scrapers never replay it twice,
+    and deleted once all its posts are stored.
+    """
+    report = {"logs": 0, "posts": 0, "saved": 0, "failed": 0}
+
+    # A replay that crashed after claiming its file leaves it renamed; put it back
+    for claimed_path in glob.glob(os.path.join(log_dir, "*.jsonl.replaying")):
+        if datetime.now().timestamp() - os.path.getmtime(claimed_path) > 3600:
+            os.replace(claimed_path, claimed_path[:-len(".replaying")])
+
+    for path in sorted(glob.glob(os.path.join(log_dir, "*.jsonl"))):
+        session_id = os.path.basename(path)[:-len(".jsonl")]
+        with _active_lock:
+            if session_id in _active_sessions:
+                continue
+
+        try:
+            header, groups = read_unsaved_posts(path)
+        except Exception as e:
+            logger.error(f"Error reading scrape log {path}: {str(e)}")
+            continue
+
+        # os.kill(pid, 0) would send CTRL_C_EVENT on Windows, so go by age there
+        pid = header.get("pid")
+        if os.name == "nt":
+            if (datetime.now().timestamp() - os.path.getmtime(path)) < 3600:
+                continue
+        elif pid is not None and pid != os.getpid() and _pid_alive(pid):
+            continue
+
+        claimed_path = path + ".replaying"
+        try:
+            os.rename(path, claimed_path)
+        except OSError:
+            continue  # another scraper got there first
+
+        report["logs"] += 1
+        failed = []
+        for (profile_url, category), posts in groups.items():
+            report["posts"] += len(posts)
+            try:
+                ok = save_fn(posts, category, profile_url)
+            except Exception as e:
+                logger.error(f"Error replaying posts for {profile_url}: {str(e)}")
+                ok = False
+            if ok:
+                report["saved"] += len(posts)
+            else:
+                report["failed"] += len(posts)
+                failed.extend((profile_url, post) for post in posts)
+
+        if failed:
+            # Keep only what is still unsaved for the next attempt
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"type": "session", "session_id": session_id, "pid": None, "started_at": header.get("started_at")}) + "\n")
+                for profile_url, post in failed:
+                    f.write(json.dumps({"type": "post", "id": make_post_id(profile_url, post["post_text"]), "profile_url": profile_url, "post": post}) + "\n")
+        os.remove(claimed_path)
+
+    if report["logs"]:
+        logger.info(f"Replayed {report['saved']} of {report['posts']} unsaved posts from {report['logs']} scrape logs")
+    return report
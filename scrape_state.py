@@ -0,0 +1,109 @@
+import os
+import json
+import logging
+import tempfile
+import threading
+from datetime import datetime
+
+from post_ids import normalize_profile_url
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = "scrape_state.json"
+
+# How many of the newest post fingerprints to remember per profile
+HIGH_WATER_SIZE = 10
+
+# Stop reasons showing a scrape read the feed down to its previous mark (or
+# to its end), so nothing is left unstored between the old and new marks
+MARK_REACHED_STOP_REASONS = ("high_water_mark", "feed_exhausted")
+
+
+class HighWaterMarks:
+    """Per-profile fingerprints of the newest stored posts.
+
+    The scraper stops scrolling a feed once it reaches posts recorded here,
+    since everything below them has been stored already.
+    """
+
+    def __init__(self, chroma_db_path="chroma_db"):
+        self.path = os.path.join(chroma_db_path, STATE_FILENAME)
+        self._lock = threading.Lock()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading scrape state: {str(e)}")
+            return {}
+
+    def _write(self, state):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # A unique temp file, so concurrent writers never share (or tear) one
+        fd, tmp_path = tempfile.mkstemp(prefix=STATE_FILENAME + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, profile_url):
+        """Return the set of known newest-post fingerprints for a profile."""
+        with self._lock:
+            entry = self._read().get(normalize_profile_url(profile_url), {})
+            return set(entry.get("fingerprints", []))
+
+    def update(self, profile_url, fingerprints):
+        """Record the newest fingerprints (in feed order, newest first) after a successful save."""
+        fingerprints = list(dict.fromkeys(fingerprints))[:HIGH_WATER_SIZE]
+        if not fingerprints:
+            return
+
+        with self._lock:
+            state = self._read()
+            state[normalize_profile_url(profile_url)] = {
+                "fingerprints": fingerprints,
+                "updated_at": datetime.now().isoformat()
+            }
+            self._write(state)
+
+    def clear(self, profile_url=None):
+        """Forget one profile's mark (forcing a full scroll next time), or all of them."""
+        with self._lock:
+            state = {}
+            if profile_url is not None:
+                state = self._read()
+                state.pop(normalize_profile_url(profile_url), None)
+            self._write(state)
+
+
+def mark_reached(stop_reason, previous_mark):
+    """True if a scrape that stopped for stop_reason may replace previous_mark.
+
+    A scrape that stopped early (target reached, redirect, stalled feed)
+    before getting back to the old mark would otherwise skip the posts in
+    between on every later run.
+    """
+    return not previous_mark or stop_reason in MARK_REACHED_STOP_REASONS
+
+
+_marks = {}
+_marks_lock = threading.Lock()
+
+
+def get_high_water_marks(chroma_db_path="chroma_db"):
+    """Return the process-wide high-water marks for a ChromaDB path, so every scraper shares one lock."""
+    key = os.path.abspath(chroma_db_path)
+    with _marks_lock:
+        marks = _marks.get(key)
+        if marks is None:
+            marks = HighWaterMarks(chroma_db_path)
+            _marks[key] = marks
+        return marks
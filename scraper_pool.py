@@ -0,0 +1,369 @@
+import os
+import sys
+import time
+import queue
+import atexit
+import logging
+import argparse
+import threading
+from concurrent.futures import Future
+
+import pandas as pd
+
+from linkedin_scraper import LinkedInScraper
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# How long callers wait for one profile before giving up on it (a hung
+# Chrome would otherwise block them forever)
+SCRAPE_TIMEOUT_S = 600
+
+
+class ScrapeJob:
+    """One profile to scrape, plus the future its result is delivered on."""
+
+    def __init__(self, profile_url, category, profile_name_override=None, max_posts=None):
+        self.profile_url = profile_url
+        self.category = category
+        self.profile_name_override = profile_name_override
+        self.max_posts = max_posts
+        self.future = Future()
+        # Set by ScraperPool.cancel to stop a running scrape at its next scroll
+        self.cancel_event = threading.Event()
+
+
+class ScraperWorker(threading.Thread):
+    """Thread owning one long-lived, logged-in LinkedInScraper browser."""
+
+    def __init__(self, pool, worker_id):
+        super().__init__(name=f"scraper-worker-{worker_id}", daemon=True)
+        self.pool = pool
+        self.worker_id = worker_id
+        self.scraper = None
+
+        # Throughput metrics
+        self.startup_time = None
+        self.profiles_scraped = 0
+        self.posts_scraped = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.browser_replacements = 0
+
+    def start_browser(self):
+        start = time.perf_counter()
+        self.scraper = LinkedInScraper(**self.pool.worker_kwargs(self.worker_id))
+        self.pool.share_login(self.scraper)
+        self.startup_time = time.perf_counter() - start
+        logger.info(f"Worker {self.worker_id} ready in {self.startup_time:.1f}s")
+
+    def replace_browser(self):
+        """Swap a scraper whose browser could not be relaunched for a new one; return False if that fails too."""
+        logger.warning(f"Worker {self.worker_id} browser is unavailable, starting a new scraper")
+        self.scraper.close()
+        try:
+            self.start_browser()
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id} could not replace its browser: {str(e)}")
+            self.errors += 1
+            return False
+        self.browser_replacements += 1
+        return True
+
+    def run(self):
+        try:
+            self.start_browser()
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id} failed to start: {str(e)}")
+            self.errors += 1
+            self.pool.worker_failed(self)
+            return
+
+        while True:
+            job = self.pool.jobs.get()
+            if job is _STOP:
+                self.pool.jobs.task_done()
+                break
+
+            if not job.future.set_running_or_notify_cancel():
+                self.pool.jobs.task_done()
+                continue
+
+            start = time.perf_counter()
+            try:
+                self.scraper.max_posts = job.max_posts or self.pool.scraper_kwargs.get('max_posts', 50)
+                self.scraper.cancel_event = job.cancel_event
+                posts = self.scraper.scrape_user_profile(
+                    job.profile_url,
+                    job.category,
+                    profile_name_override=job.profile_name_override
+                )
+                self.profiles_scraped += 1
+                self.posts_scraped += len(posts)
+                outcome = self.scraper.last_scrape
+                self.pool.last_scrapes[job.profile_url] = dict(outcome) if outcome.get('profile_url') == job.profile_url else {}
+                job.future.set_result(posts)
+            except Exception as e:
+                self.errors += 1
+                job.future.set_exception(e)
+            finally:
+                self.scraper.cancel_event = None
+                self.busy_time += time.perf_counter() - start
+                self.pool.jobs.task_done()
+
+            if not self.scraper.healthy and not self.replace_browser():
+                self.pool.worker_failed(self)
+                return
+
+        self.scraper.close()
+
+    def get_stats(self):
+        return {
+            "worker_id": self.worker_id,
+            "alive": self.is_alive(),
+            "startup_time_s": self.startup_time,
+            "startup_phases": self.scraper.get_startup_stats() if self.scraper else {},
+            "profiles_scraped": self.profiles_scraped,
+            "posts_scraped": self.posts_scraped,
+            "errors": self.errors,
+            "browser_replacements": self.browser_replacements,
+            "busy_time_s": self.busy_time,
+            "profiles_per_hour": self.profiles_scraped / self.busy_time * 3600 if self.busy_time else 0.0,
+            "posts_per_minute": self.posts_scraped / self.busy_time * 60 if self.busy_time else 0.0,
+            "wait_stats": self.scraper.get_wait_stats() if self.scraper else {},
+            "traffic_stats": self.scraper.get_traffic_stats() if self.scraper else {},
+            "pipeline_stats": self.scraper.get_pipeline_stats() if self.scraper else {},
+            "scroll_stats": self.scraper.get_scroll_stats() if self.scraper else {},
+            "lifecycle_stats": self.scraper.get_lifecycle_stats() if self.scraper else {}
+        }
+
+
+class ScraperPool:
+    """N long-lived browser workers pulling profile URLs from a shared work queue.
+
+    Only the first worker logs in (or resumes the saved session); the others
+    reuse its session cookies.
+    """
+
+    def __init__(self, num_workers=2, headless=True, debug=False, max_posts=50, chroma_db_path="chroma_db"):
+        self.num_workers = num_workers
+        self.scraper_kwargs = {
+            "headless": headless,
+            "debug": debug,
+            "max_posts": max_posts,
+            "chroma_db_path": chroma_db_path
+        }
+        self.jobs = queue.Queue()
+        self.workers = []
+        self._login_lock = threading.Lock()
+        self._session_cookies = None
+        # Stop reason and posts seen of the latest scrape of each profile
+        self.last_scrapes = {}
+        # Jobs not finished yet, by future, so callers can cancel them
+        self._pending_jobs = {}
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._started:
+                return self
+            for worker_id in range(self.num_workers):
+                worker = ScraperWorker(self, worker_id)
+                worker.start()
+                self.workers.append(worker)
+            self._started = True
+        return self
+
+    def worker_kwargs(self, worker_id):
+        """LinkedInScraper arguments for one worker.
+
+        Chrome will not open a user-data-dir that another browser is using, so
+        a persistent profile (LINKEDIN_CHROME_PROFILE) is split per worker.
+        The saved session is restored by share_login, not by each constructor.
+        """
+        kwargs = dict(self.scraper_kwargs, resume_session=False)
+        profile_dir = kwargs.get('user_data_dir') or os.getenv('LINKEDIN_CHROME_PROFILE')
+        if profile_dir:
+            kwargs['user_data_dir'] = os.path.join(profile_dir, f"worker-{worker_id}")
+        return kwargs
+
+    def share_login(self, scraper):
+        """Log the first browser in (resuming the saved session if it can) and hand its cookies to the rest.
+
+        Runs one browser at a time, so the saved session is restored once
+        rather than by every worker at the same moment.
+        """
+        with self._login_lock:
+            phase_start = time.perf_counter()
+            if not scraper.logged_in and not (self._session_cookies and scraper.import_cookies(self._session_cookies)):
+                scraper.ensure_logged_in()
+            scraper.startup_timings['session_restore'] = time.perf_counter() - phase_start
+            if scraper.logged_in and not self._session_cookies:
+                self._session_cookies = scraper.export_cookies()
+
+    def worker_failed(self, worker):
+        """Fail queued jobs if no worker is left to run them."""
+        if any(other.is_alive() for other in self.workers if other is not worker):
+            return
+        logger.error("No scraper workers left to run queued jobs")
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not _STOP and job.future.set_running_or_notify_cancel():
+                job.future.set_exception(RuntimeError("No scraper workers available"))
+            self.jobs.task_done()
+
+    def submit(self, profile_url, category, profile_name_override=None, max_posts=None):
+        """Queue a profile and return a Future resolving to its scraped posts."""
+        self.start()
+        job = ScrapeJob(profile_url, category, profile_name_override, max_posts)
+        self._pending_jobs[job.future] = job
+        job.future.add_done_callback(lambda future: self._pending_jobs.pop(future, None))
+        self.jobs.put(job)
+        return job.future
+
+    def cancel(self, future):
+        """Cancel a queued job, or stop a running one at its next scroll; return True if it never started.
+
+        A stopped scrape still saves the posts it found; a browser stuck
+        inside a single page call only notices once that call returns.
+        """
+        if future.cancel():
+            return True
+        job = self._pending_jobs.get(future)
+        if job is not None:
+            job.cancel_event.set()
+        return False
+
+    def get_last_scrape(self, profile_url):
+        """Return how the latest scrape of a profile ended (stop_reason, posts_seen, new_posts), or {}."""
+        return self.last_scrapes.get(profile_url, {})
+
+    def scrape_all(self, jobs):
+        """Scrape (profile_url, category[, profile_name_override]) tuples; return {profile_url: posts}.
+
+        A profile listed more than once is scraped once, with its first row's settings.
+        """
+        futures = {}
+        for job in jobs:
+            if job[0] in futures:
+                logger.info(f"Skipping duplicate job for {job[0]}")
+                continue
+            futures[job[0]] = self.submit(*job)
+        results = {}
+        for profile_url, future in futures.items():
+            try:
+                results[profile_url] = future.result()
+            except Exception as e:
+                logger.error(f"Error scraping {profile_url}: {str(e)}")
+                results[profile_url] = []
+        return results
+
+    def get_stats(self):
+        worker_stats = [worker.get_stats() for worker in self.workers]
+        return {
+            "num_workers": self.num_workers,
+            "queued_jobs": self.jobs.qsize(),
+            "profiles_scraped": sum(stats["profiles_scraped"] for stats in worker_stats),
+            "posts_scraped": sum(stats["posts_scraped"] for stats in worker_stats),
+            "workers": worker_stats
+        }
+
+    def shutdown(self, wait=True):
+        """Stop the workers and close their browsers."""
+        if not self._started:
+            return
+        for _ in self.workers:
+            self.jobs.put(_STOP)
+        if wait:
+            for worker in self.workers:
+                worker.join()
+        self._started = False
+        self.workers = []
+
+
+_pool = None
+_pool_config = None
+_pool_lock = threading.Lock()
+
+
+def get_scraper_pool(num_workers=1, **kwargs):
+    """Return the process-wide scraper pool, creating it on first use.
+
+    Later calls get the existing pool; a warning is logged if they ask for a
+    different configuration (per-profile max_posts can be passed to submit()).
+    """
+    global _pool, _pool_config
+    config = dict(kwargs, num_workers=num_workers)
+    with _pool_lock:
+        if _pool is None:
+            _pool = ScraperPool(num_workers=num_workers, **kwargs)
+            _pool_config = config
+            atexit.register(_pool.shutdown, False)
+        elif config != _pool_config:
+            logger.warning(f"Scraper pool already running with {_pool_config}; ignoring requested {config}")
+        return _pool
+
+
+def refresh_from_csv(csv_path="linkedin_profiles_summary.csv", num_workers=4, max_posts=50, headless=True, backend="selenium"):
+    """Re-scrape every creator listed in the profiles CSV with a pool of workers.
+
+    backend="playwright" scrapes num_workers profiles as concurrent tabs of a
+    single browser instead of running one browser per worker.
+    """
+    df = pd.read_csv(csv_path)
+    jobs = [(row['Post_URL'], row['Cat']) for _, row in df.iterrows()]
+
+    if backend == "playwright":
+        from playwright_scraper import scrape_profiles
+        results, stats = scrape_profiles(jobs, max_concurrency=num_workers, max_posts=max_posts, headless=headless)
+        logger.info(
+            f"Refreshed {len(jobs)} profiles ({stats['posts_scraped']} new posts) in {stats['run_time_s']:.0f}s "
+            f"with {num_workers} tabs, {stats['profiles_per_hour']:.0f} profiles/hour"
+        )
+        return results
+
+    pool = ScraperPool(num_workers=num_workers, headless=headless, max_posts=max_posts)
+    start = time.perf_counter()
+    try:
+        results = pool.scrape_all(jobs)
+    finally:
+        stats = pool.get_stats()
+        pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Refreshed {len(jobs)} profiles ({stats['posts_scraped']} new posts) in {elapsed:.0f}s with {num_workers} workers")
+    for worker_stats in stats["workers"]:
+        lifecycle = worker_stats["lifecycle_stats"]
+        logger.info(
+            f"Worker {worker_stats['worker_id']}: {worker_stats['profiles_scraped']} profiles, "
+            f"{worker_stats['posts_scraped']} posts, {worker_stats['profiles_per_hour']:.0f} profiles/hour, "
+            f"{lifecycle.get('restarts', 0)} browser restarts (peak {lifecycle.get('peak_rss_mb') or 0:.0f} MB)"
+        )
+    return results
+
+
+def main():
+    """Command line entry point for bulk refreshes."""
+    parser = argparse.ArgumentParser(description="Re-scrape all creators in the profiles CSV")
+    parser.add_argument("--csv", default="linkedin_profiles_summary.csv")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-posts", type=int, default=50)
+    parser.add_argument("--show-browser", action="store_true")
+    parser.add_argument("--backend", default="selenium", choices=["selenium", "playwright"],
+                        help="playwright runs the workers as tabs of one browser")
+    args = parser.parse_args()
+
+    try:
+        refresh_from_csv(args.csv, num_workers=args.workers, max_posts=args.max_posts, headless=not args.show_browser, backend=args.backend)
+    except Exception as e:
+        logger.error(f"Error refreshing profiles: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import math
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Hard ceiling on scrolls per profile, whatever the observed rate suggests
+MAX_SCROLLS = 60
+
+# Scrolls in a row that load nothing before the feed counts as exhausted
+EXHAUSTED_AFTER = 2
+
+# Scrolls in a row whose growth wait timed out (or mixed with no-growth
+# scrolls) before giving up on the feed
+STALLED_AFTER = 4
+
+
+class ScrollController:
+    """Decides how long to keep scrolling a feed.
+
+    Each scroll jumps to the last post container, so every step triggers the
+    next page load regardless of how tall posts are. The scroll budget is
+    re-estimated from the observed posts per scroll, so creators with short
+    posts are not cut off by a fixed limit, and scrolling stops as soon as
+    the feed stops growing.
+    """
+
+    def __init__(self, target_posts, max_scrolls=MAX_SCROLLS, exhausted_after=EXHAUSTED_AFTER, stalled_after=STALLED_AFTER):
+        self.target_posts = target_posts
+        self.max_scrolls = max_scrolls
+        self.exhausted_after = exhausted_after
+        self.stalled_after = stalled_after
+        self.start_time = time.perf_counter()
+
+        self.scrolls = 0
+        self.posts = 0
+        self.no_growth_streak = 0
+        self.unproductive_streak = 0
+        self.exhausted = False
+        self.stalled = False
+        self.stop_reason = None
+
+    @property
+    def posts_per_scroll(self):
+        return self.posts / self.scrolls if self.scrolls else None
+
+    def scroll_budget(self):
+        """Scrolls expected to reach the target at the observed rate (plus one spare), capped."""
+        rate = self.posts_per_scroll
+        if not rate:
+            return self.max_scrolls
+        remaining = max(self.target_posts - self.posts, 0)
+        return min(self.max_scrolls, self.scrolls + math.ceil(remaining / rate) + 1)
+
+    def should_continue(self, total_posts):
+        """Return False once the target is reached, the feed is exhausted or the budget is spent."""
+        self.posts = total_posts
+        if total_posts >= self.target_posts:
+            self.stop_reason = "target_reached"
+        elif self.exhausted:
+            self.stop_reason = "feed_exhausted"
+        elif self.stalled:
+            self.stop_reason = "feed_stalled"
+        elif self.scrolls >= self.scroll_budget():
+            self.stop_reason = "scroll_budget"
+        else:
+            return True
+        return False
+
+    def stop(self, reason, total_posts=None):
+        """Record a stop decided outside the controller (redirect, already-stored posts)."""
+        if total_posts is not None:
+            self.posts = total_posts
+        self.stop_reason = reason
+
+    def record_scroll(self, grew):
+        """Record whether a scroll loaded new post containers.
+
+        grew is True, False (the page stayed idle after the scroll) or None
+        (the wait timed out, so it is unknown whether anything loaded).
+        """
+        self.scrolls += 1
+        if grew:
+            self.no_growth_streak = 0
+            self.unproductive_streak = 0
+            return
+        # A timeout says nothing about the feed's end, but endless ones mean it isn't loading
+        self.unproductive_streak += 1
+        if self.unproductive_streak >= self.stalled_after:
+            self.stalled = True
+        if grew is None:
+            return
+        # One quiet scroll can be a slow response; a second one means the end
+        self.no_growth_streak += 1
+        if self.no_growth_streak >= self.exhausted_after:
+            self.exhausted = True
+
+    def get_stats(self):
+        elapsed = time.perf_counter() - self.start_time
+        return {
+            "scrolls": self.scrolls,
+            "posts": self.posts,
+            "posts_per_scroll": self.posts_per_scroll or 0.0,
+            "elapsed_s": elapsed,
+            "posts_per_sec": self.posts / elapsed if elapsed else 0.0,
+            "stop_reason": self.stop_reason
+        }
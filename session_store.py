@@ -0,0 +1,123 @@
+import os
+import json
+import base64
+import hashlib
+import logging
+import tempfile
+import threading
+from datetime import datetime
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SESSION_FILENAME = "linkedin_session.enc"
+
+# Sessions older than this are not worth validating; log in again instead
+MAX_SESSION_AGE_DAYS = 30
+
+
+def derive_session_key(email, password):
+    """Derive a Fernet key from the LinkedIn credentials already kept in the environment."""
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), email.lower().encode("utf-8"), 200000)
+    return base64.urlsafe_b64encode(digest)
+
+
+class SessionStore:
+    """Encrypted on-disk copy of a logged-in browser's cookies and localStorage.
+
+    The key comes from LINKEDIN_SESSION_KEY if set, otherwise it is derived
+    from the LinkedIn credentials, so the file is useless without them.
+    Without the cryptography package nothing is persisted.
+    """
+
+    def __init__(self, path=os.path.join("chroma_db", SESSION_FILENAME), email=None, password=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fernet = None
+
+        if not CRYPTOGRAPHY_AVAILABLE:
+            logger.warning("cryptography is not installed; the browser session will not be persisted")
+            return
+
+        key = os.getenv("LINKEDIN_SESSION_KEY")
+        if key:
+            key = key.encode("utf-8")
+        elif email and password:
+            key = derive_session_key(email, password)
+        else:
+            logger.warning("No session key available; the browser session will not be persisted")
+            return
+        try:
+            self._fernet = Fernet(key)
+        except Exception as e:
+            # A malformed LINKEDIN_SESSION_KEY only costs a fresh login, never the scraper
+            logger.error(f"Invalid session key, the browser session will not be persisted: {str(e)}")
+
+    @property
+    def enabled(self):
+        return self._fernet is not None
+
+    def load(self):
+        """Return the saved state dict, or None if there is no usable session."""
+        if not self.enabled or not os.path.exists(self.path):
+            return None
+
+        with self._lock:
+            try:
+                with open(self.path, "rb") as f:
+                    state = json.loads(self._fernet.decrypt(f.read()).decode("utf-8"))
+            except InvalidToken:
+                logger.warning("Saved session could not be decrypted (credentials or key changed)")
+                return None
+            except Exception as e:
+                logger.error(f"Error reading saved session: {str(e)}")
+                return None
+
+        saved_at = state.get("saved_at")
+        if saved_at and (datetime.now() - datetime.fromisoformat(saved_at)).days > MAX_SESSION_AGE_DAYS:
+            logger.info("Saved session is too old, ignoring it")
+            return None
+        return state
+
+    def save(self, cookies, local_storage=None):
+        """Encrypt and write the session state atomically."""
+        if not self.enabled:
+            return False
+
+        state = {
+            "saved_at": datetime.now().isoformat(),
+            "cookies": cookies,
+            "local_storage": local_storage or {}
+        }
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path) or "."
+                os.makedirs(directory, exist_ok=True)
+                # mkstemp creates the file 0600, so the session is never readable by others
+                fd, tmp_path = tempfile.mkstemp(prefix=SESSION_FILENAME + ".", suffix=".tmp", dir=directory)
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(self._fernet.encrypt(json.dumps(state).encode("utf-8")))
+                    os.replace(tmp_path, self.path)
+                except Exception:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+                logger.info(f"Saved browser session with {len(cookies)} cookies")
+                return True
+            except Exception as e:
+                logger.error(f"Error saving session: {str(e)}")
+                return False
+
+    def clear(self):
+        """Delete the saved session, e.g. after LinkedIn rejected it."""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,207 @@
+import re
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup, NavigableString, Comment
+
+from feed_selectors import (
+    PROFILE_NAME_SELECTORS, POST_CONTAINER_SELECTORS, ACTIVITY_TEXTS, CONTENT_SELECTORS,
+    TEXT_SELECTORS, SEE_MORE_SELECTORS, TIMESTAMP_SELECTORS, REACTIONS_SELECTORS, COMMENTS_SELECTORS
+)
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+logger = logging.getLogger(__name__)
+
+# capture_snapshot() writes the page URL into this comment at the top of the file
+SNAPSHOT_URL_PATTERN = re.compile(r"<!--\s*lcg-snapshot-url:\s*(\S+)\s*-->")
+
+SKIP_TAGS = {"script", "style", "template", "noscript", "svg", "head"}
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "div", "dl", "dt", "dd", "figure", "footer",
+    "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol",
+    "p", "pre", "section", "table", "tr", "ul"
+}
+
+
+def _is_hidden(tag):
+    if tag.has_attr("hidden"):
+        return True
+    style = tag.get("style", "").replace(" ", "").lower()
+    return "display:none" in style
+
+
+def inner_text(element):
+    """Approximate the browser's innerText: collapsed whitespace, line breaks at <br> and blocks."""
+    if any(_is_hidden(tag) for tag in [element, *element.parents] if tag.name and tag.name != "[document]"):
+        return ""
+    parts = []
+
+    def walk(node):
+        for child in node.children:
+            if isinstance(child, Comment):
+                continue
+            if isinstance(child, NavigableString):
+                parts.append(re.sub(r"\s+", " ", str(child)))
+            elif child.name in SKIP_TAGS or _is_hidden(child):
+                continue
+            elif child.name == "br":
+                parts.append("\n")
+            elif child.name in BLOCK_TAGS:
+                parts.append("\n")
+                walk(child)
+                parts.append("\n\n" if child.name == "p" else "\n")
+            else:
+                walk(child)
+
+    walk(element)
+    lines = [line.strip() for line in "".join(parts).split("\n")]
+    text = "\n".join(lines).strip()
+    return re.sub(r"\n{3,}", "\n\n", text)
+
+
+def clean_post_text(text):
+    """Same clean-up the live extraction paths apply."""
+    text = re.sub(r'\n\s*\n', '\n\n', text or '')
+    text = re.sub(r' +', ' ', text)
+    return text.strip()
+
+
+def parse_count(text):
+    """Turn '1,234', '2.5K' or '12 comments' into an int."""
+    if not text:
+        return None
+    match = re.search(r"([\d.]+)\s*([KkMm]?)", text.replace(",", ""))
+    if not match:
+        return None
+    try:
+        value = float(match.group(1))
+    except ValueError:
+        return None
+    scale = {"k": 1e3, "m": 1e6}.get(match.group(2).lower(), 1)
+    return round(value * scale)
+
+
+def _first_text(root, selectors):
+    for selector in selectors:
+        element = root.select_one(selector)
+        if element is not None:
+            text = inner_text(element)
+            if text:
+                return text
+    return None
+
+
+def _is_original(container, container_text):
+    text = container_text.lower()
+    for activity in ACTIVITY_TEXTS:
+        if text.startswith(activity) or f"\n{activity}" in text[:50]:
+            return False
+    return any(inner_text(element) for selector in CONTENT_SELECTORS for element in container.select(selector))
+
+
+def _post_urn(container):
+    if container.has_attr("data-urn"):
+        return container["data-urn"]
+    holder = container.select_one("[data-urn]") or container.find_parent(attrs={"data-urn": True})
+    return holder["data-urn"] if holder is not None else None
+
+
+def extract_profile_name_from_soup(soup, page_url=None):
+    """Profile name from the page heading, else from the /in/ part of the URL."""
+    name = _first_text(soup, PROFILE_NAME_SELECTORS)
+    if name:
+        return name
+    if page_url and '/in/' in page_url:
+        return page_url.split('/in/')[1].split('/')[0].replace('-', ' ').title()
+    return "Unknown Profile"
+
+
+def parse_snapshot(html, category=None, profile_name=None, page_url=None):
+    """Extract original posts from a captured feed page.
+
+    Returns {"profile_name", "page_url", "containers", "posts"}, where posts
+    have the same fields as the live extraction. Snapshots are expected to be
+    taken after "see more" was expanded; LinkedIn's line clamp is CSS only, so
+    the full text is usually in the markup either way.
+    """
+    if page_url is None:
+        match = SNAPSHOT_URL_PATTERN.search(html[:1000])
+        page_url = match.group(1) if match else None
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    # "…more" toggles sit inside the text containers; the text behind them is already in the markup
+    for selector in SEE_MORE_SELECTORS:
+        for button in soup.select(selector):
+            button.decompose()
+
+    profile_name = profile_name or extract_profile_name_from_soup(soup, page_url)
+
+    containers = []
+    for selector in POST_CONTAINER_SELECTORS:
+        containers = soup.select(selector)
+        if containers:
+            break
+
+    posts = []
+    seen_texts = set()
+    for container in containers:
+        container_text = inner_text(container)
+        if not container_text or not _is_original(container, container_text):
+            continue
+
+        post_text = ""
+        for selector in TEXT_SELECTORS:
+            for element in container.select(selector):
+                candidate = inner_text(element)
+                if len(candidate) > len(post_text):
+                    post_text = candidate
+        if not post_text:
+            fallback = [inner_text(element) for element in container.select("p, span.break-words, div.break-words")]
+            post_text = "\n".join(text for text in fallback if text)
+
+        post_text = clean_post_text(post_text)
+        if len(post_text) < 10 or post_text in seen_texts:
+            continue
+        seen_texts.add(post_text)
+
+        post = {
+            'profile_name': profile_name,
+            'post_text': post_text,
+            'category': category
+        }
+        record = {
+            'post_urn': _post_urn(container),
+            'timestamp_text': _first_text(container, TIMESTAMP_SELECTORS),
+            'reactions': parse_count(_first_text(container, REACTIONS_SELECTORS)),
+            'comments': parse_count(_first_text(container, COMMENTS_SELECTORS))
+        }
+        post.update({key: value for key, value in record.items() if value is not None})
+        posts.append(post)
+
+    return {
+        "profile_name": profile_name,
+        "page_url": page_url,
+        "containers": len(containers),
+        "posts": posts
+    }
+
+
+def parse_snapshot_file(path, category=None, profile_name=None):
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_snapshot(f.read(), category=category, profile_name=profile_name)
+
+
+def parse_snapshot_files(paths, category=None, workers=None):
+    """Parse many snapshots in parallel processes; returns {path: result}."""
+    paths = list(paths)
+    if workers == 1 or len(paths) < 2:
+        return {path: parse_snapshot_file(path, category) for path in paths}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(parse_snapshot_file, paths, [category] * len(paths))
+        return dict(zip(paths, results))